@@ -1,41 +1,114 @@
 """
 Clear all data from the database
 """
-from database import SessionLocal, engine
-from db_models.all_models import *
+from database import make_script_engine
 from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+engine = make_script_engine()
+
+# Children first so the SQLite DELETE path respects foreign keys
+TABLES_TO_CLEAR = [
+    'suspense_items',
+    'matches',
+    'regularization_entries',
+    'performance_metrics',
+    'ai_call_logs',
+    'audit_logs',
+    'bank_transactions',
+    'accounting_transactions',
+    'reconciliations',
+    'uploaded_files',
+]
+
+# Child tables removed before the reconciliation row itself
+RECONCILIATION_CHILD_TABLES = [
+    'suspense_items',
+    'matches',
+    'regularization_entries',
+    'performance_metrics',
+]
+
+DELETE_BATCH_SIZE = 10000
+
+def bulk_delete_reconciliation(recon_id: str, skip_fk_validation: bool = False):
+    """Delete a reconciliation and its children in windowed batches, in one transaction.
+
+    Avoids the ORM cascade, which issues one DELETE per child row.
+    skip_fk_validation disables FK checks for the duration (admin/clear flows only).
+    """
+    db = Session(bind=engine)
+    is_postgres = engine.dialect.name == "postgresql"
+    try:
+        if skip_fk_validation and not is_postgres:
+            db.execute(text("PRAGMA foreign_keys=OFF"))
+
+        if skip_fk_validation and is_postgres:
+            # Reverts automatically at the end of the transaction
+            db.execute(text("SET LOCAL session_replication_role = replica"))
+
+        deleted = {}
+        for table in RECONCILIATION_CHILD_TABLES:
+            deleted[table] = 0
+            while True:
+                result = db.execute(
+                    text(
+                        f"DELETE FROM {table} WHERE id IN "
+                        f"(SELECT id FROM {table} WHERE reconciliation_id = :r LIMIT :lim)"
+                    ),
+                    {"r": recon_id, "lim": DELETE_BATCH_SIZE}
+                )
+                deleted[table] += result.rowcount
+                if result.rowcount < DELETE_BATCH_SIZE:
+                    break
+
+        result = db.execute(text("DELETE FROM reconciliations WHERE id = :r"), {"r": recon_id})
+        deleted['reconciliations'] = result.rowcount
+        db.commit()
+
+        for table, count in deleted.items():
+            print(f"✅ {table}: {count} rows deleted")
+        return deleted
+
+    except Exception as e:
+        print(f"❌ Error deleting reconciliation {recon_id}: {e}")
+        db.rollback()
+        raise
+    finally:
+        if skip_fk_validation and not is_postgres:
+            db.execute(text("PRAGMA foreign_keys=ON"))
+        db.close()
 
 def clear_all_data():
-    db = SessionLocal()
+    db = Session(bind=engine)
     try:
         print("🗑️  Clearing all data from database...")
-        
-        # Delete in correct order (respecting foreign keys)
-        tables_to_clear = [
-            'suspense_items',
-            'matches',
-            'regularization_entries',
-            'performance_metrics',
-            'ai_call_logs',
-            'audit_logs',
-            'bank_transactions',
-            'accounting_transactions',
-            'reconciliations',
-            'uploaded_files',
-        ]
-        
-        for table in tables_to_clear:
-            try:
-                result = db.execute(text(f"DELETE FROM {table}"))
-                db.commit()
-                print(f"✅ Cleared {table}: {result.rowcount} rows deleted")
-            except Exception as e:
-                print(f"⚠️  {table}: {e}")
-                db.rollback()
-        
+
+        # Count rows once up front, the bulk statements below don't report per-table counts
+        row_counts = {
+            table: db.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in TABLES_TO_CLEAR
+        }
+
+        # Single transaction: one commit instead of one per table
+        if engine.dialect.name == "postgresql":
+            db.execute(text(f"TRUNCATE TABLE {', '.join(TABLES_TO_CLEAR)} RESTART IDENTITY CASCADE"))
+        else:
+            # PRAGMA foreign_keys is a no-op inside a transaction, so set it before the deletes start
+            db.execute(text("PRAGMA foreign_keys=OFF"))
+            for table in TABLES_TO_CLEAR:
+                db.execute(text(f"DELETE FROM {table}"))
+        db.commit()
+
+        if engine.dialect.name != "postgresql":
+            db.execute(text("PRAGMA foreign_keys=ON"))
+
+        for table in TABLES_TO_CLEAR:
+            print(f"✅ Cleared {table}: {row_counts[table]} rows deleted")
+
         print("\n✨ Database cleared successfully!")
         print("You can now upload fresh files for reconciliation.")
-        
+
     except Exception as e:
         print(f"❌ Error clearing database: {e}")
         db.rollback()
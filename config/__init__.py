@@ -0,0 +1,44 @@
+"""
+Application configuration - everything lives in config.settings
+"""
+from config.settings import (
+    Settings,
+    get_settings,
+    settings,
+    GEMINI_API_KEY,
+    CLAUDE_API_KEY,
+    ENABLE_AI_FALLBACK,
+    DATABASE_URL,
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    UPLOAD_DIR,
+    REPORT_DIR,
+    LOG_DIR,
+    CACHE_DIR,
+    AI_CACHE_TTL_SECONDS,
+    AI_MEMORY_CACHE_SIZE,
+    DEFAULT_RULES,
+    AI_CONFIG,
+)
+
+__all__ = [
+    "Settings",
+    "get_settings",
+    "settings",
+    "GEMINI_API_KEY",
+    "CLAUDE_API_KEY",
+    "ENABLE_AI_FALLBACK",
+    "DATABASE_URL",
+    "SECRET_KEY",
+    "ALGORITHM",
+    "ACCESS_TOKEN_EXPIRE_MINUTES",
+    "UPLOAD_DIR",
+    "REPORT_DIR",
+    "LOG_DIR",
+    "CACHE_DIR",
+    "AI_CACHE_TTL_SECONDS",
+    "AI_MEMORY_CACHE_SIZE",
+    "DEFAULT_RULES",
+    "AI_CONFIG",
+]
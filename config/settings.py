@@ -0,0 +1,92 @@
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Environment-derived settings, resolved once per process.
+
+    Read settings from here rather than calling os.getenv() elsewhere.
+    """
+    gemini_api_key: Optional[str]
+    claude_api_key: Optional[str]
+    anthropic_api_key: Optional[str]
+    database_url: str
+    secret_key: str
+    dev_reload: bool
+    workers: int
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_recycle: int
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Parse .env once and cache the resolved settings"""
+    load_dotenv()
+    return Settings(
+        gemini_api_key=os.environ.get("GEMINI_API_KEY"),
+        claude_api_key=os.environ.get("CLAUDE_API_KEY"),
+        anthropic_api_key=os.environ.get("ANTHROPIC_API_KEY"),
+        database_url=os.environ.get("DATABASE_URL", "sqlite:///./reconciliation.db"),
+        secret_key=os.environ.get("SECRET_KEY", "your-secret-key-change-in-production"),
+        dev_reload=os.environ.get("DEV") == "1",
+        workers=int(os.environ.get("WORKERS", "1")),
+        db_pool_size=int(os.environ.get("DB_POOL_SIZE", "20")),
+        db_max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+        db_pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", "3600")),
+    )
+
+settings = get_settings()
+
+# API Keys
+GEMINI_API_KEY = settings.gemini_api_key
+CLAUDE_API_KEY = settings.claude_api_key
+
+# AI Fallback Strategy: Try Gemini first, then Claude, then backend logic
+ENABLE_AI_FALLBACK = True
+
+# Database
+DATABASE_URL = settings.database_url
+
+# Authentication
+SECRET_KEY = settings.secret_key
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30
+
+# Directories
+UPLOAD_DIR = "storage/uploads"
+REPORT_DIR = "storage/reports"
+LOG_DIR = "storage/logs"
+CACHE_DIR = "storage/cache"
+
+# AI fallback results cached on disk by input-text hash
+AI_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# AI assistant results also kept in process, most recently used first
+AI_MEMORY_CACHE_SIZE = 10_000
+
+# Reconciliation Rules (read-only view, copy with dict(DEFAULT_RULES) to customise)
+DEFAULT_RULES = MappingProxyType({
+    "amount_tolerance": 0.01,
+    "date_tolerance_days": 1,
+    "fuzzy_date_tolerance_days": 3,
+    "weak_date_tolerance_days": 7,
+    "label_similarity_threshold": 0.95,
+    "fuzzy_label_threshold": 0.80,
+    "weak_label_threshold": 0.60,
+    "enable_group_matching": True,
+    "max_group_size": 5
+})
+
+# AI Settings
+AI_CONFIG = {
+    "temperature": 0.1,
+    "max_output_tokens": 50,
+    "batch_size": 50,  # items per prompt for the *_batch functions
+    # Local label similarity model, used when sentence-transformers is installed
+    "embedding_model": "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+    "gemini_model": "gemini-2.0-flash-exp",
+    "claude_model": "claude-3-haiku-20240307"
+}
\ No newline at end of file
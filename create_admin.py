@@ -3,13 +3,14 @@
 Create default admin user
 """
 
-from database import SessionLocal
+from sqlalchemy.orm import Session
+from database import make_script_engine
 from services.auth_service import create_user
 from db_models.users import User
 
 def create_admin_user():
     """Create default admin user if not exists"""
-    db = SessionLocal()
+    db = Session(bind=make_script_engine())
     
     try:
         # Check if admin exists
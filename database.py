@@ -1,11 +1,32 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from config import DATABASE_URL
+from sqlalchemy.pool import NullPool
+from config import DATABASE_URL, settings
+from functools import lru_cache
 import os
 
-# Create database engine
-engine = create_engine(DATABASE_URL, echo=False)
+# Create database engine (built once per process, shared by every importer)
+@lru_cache(maxsize=1)
+def get_engine():
+    if DATABASE_URL.startswith("sqlite"):
+        return create_engine(DATABASE_URL, echo=False)
+    # Sized for concurrent request sessions plus threadpool work, tunable via DB_POOL_* env vars
+    return create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_pre_ping=True,
+        pool_recycle=settings.db_pool_recycle,
+    )
+
+engine = get_engine()
+
+# Engine for one-shot CLI scripts: no pool to build or keep connections alive in
+@lru_cache(maxsize=1)
+def make_script_engine():
+    return create_engine(DATABASE_URL, echo=False, poolclass=NullPool)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -22,5 +43,5 @@ def get_db():
         db.close()
 
 # Create all tables
-def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+def create_tables(bind=None):
+    Base.metadata.create_all(bind=bind or engine)
\ No newline at end of file
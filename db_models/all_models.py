@@ -2,6 +2,11 @@
 Import all models to ensure they are registered with SQLAlchemy
 """
 
+import io
+from typing import List
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 from db_models.base import BaseModel
 from db_models.files import UploadedFile
 from db_models.transactions import BankTransaction, AccountingTransaction
@@ -24,5 +29,75 @@ __all__ = [
     "AuditLog",
     "AICallLog",
     "User",
-    "PerformanceMetrics"
-]
\ No newline at end of file
+    "PerformanceMetrics",
+    "bulk_insert_transactions"
+]
+
+# Rows per INSERT statement: bounds statement size and memory on very large files
+BULK_INSERT_BATCH_SIZE = 10_000
+
+# Above this many rows Postgres ingests through COPY instead of batched INSERTs
+COPY_THRESHOLD_ROWS = 50_000
+
+def bulk_insert_transactions(session: Session, rows: List[dict], is_bank: bool):
+    """Insert transaction rows (plain dicts) in batched executemany calls, bypassing the ORM unit of work.
+
+    Rows whose id already exists are skipped (ON CONFLICT DO NOTHING), so a retried upload
+    does not fail halfway or duplicate transactions.
+    """
+    if not rows:
+        return
+    model = BankTransaction if is_bank else AccountingTransaction
+    is_postgres = session.get_bind().dialect.name == "postgresql"
+    if is_postgres and len(rows) > COPY_THRESHOLD_ROWS:
+        _copy_insert(session, model, rows)
+        return
+    dialect_insert = pg_insert if is_postgres else sqlite_insert
+    stmt = dialect_insert(model).on_conflict_do_nothing(index_elements=["id"])
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        session.execute(stmt, rows[start:start + BULK_INSERT_BATCH_SIZE])
+
+# Backslash escapes of the COPY text format (the data itself can't contain a raw tab/newline)
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+def _copy_value(value) -> str:
+    return "\\N" if value is None else str(value).translate(_COPY_ESCAPES)
+
+def _copy_insert(session: Session, model, rows: List[dict]):
+    """COPY rows into a temp staging table, then move them over with INSERT ... ON CONFLICT DO NOTHING.
+
+    Runs on the session's connection, so it commits or rolls back with the rest of the upload.
+    """
+    table_name = model.__table__.name
+    columns = list(rows[0])
+    # COPY bypasses SQLAlchemy, so fill the Python-side scalar defaults (status, currency...) here
+    defaults = {
+        column.name: column.default.arg
+        for column in model.__table__.columns
+        if column.name not in rows[0] and column.default is not None and column.default.is_scalar
+    }
+    default_values = list(defaults.values())
+    column_list = ", ".join(columns + list(defaults))
+
+    # COPY text format: tab-separated, None written as \N, so '' and NULL stay distinct
+    buffer = io.StringIO()
+    buffer.writelines(
+        "\t".join(_copy_value(row[column]) for column in columns)
+        + "".join("\t" + _copy_value(value) for value in default_values)
+        + "\n"
+        for row in rows
+    )
+    buffer.seek(0)
+
+    staging = f"staging_{table_name}"
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {staging}")
+        cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP")
+        cursor.copy_expert(f"COPY {staging} ({column_list}) FROM STDIN", buffer)
+        cursor.execute(
+            f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM {staging} "
+            f"ON CONFLICT (id) DO NOTHING"
+        )
+    finally:
+        cursor.close()
@@ -1,8 +1,11 @@
-from sqlalchemy import Column, String, Text, JSON, Integer, Float
-from db_models.base import BaseModel
+from sqlalchemy import Column, String, JSON, Integer, Float, Boolean, Index
+from db_models.base import BaseModel, JSONBType
 
 class AuditLog(BaseModel):
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_event_metadata", "event_metadata", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     # Event details
     event_type = Column(String(100), nullable=False)  # upload, reconciliation, validation, ai_call
@@ -12,23 +15,23 @@ class AuditLog(BaseModel):
     # User and context
     user_id = Column(String(100), default="system")
     ip_address = Column(String(45))
-    user_agent = Column(Text)
+    user_agent = Column(String(512))
     
     # Event data
     action = Column(String(100), nullable=False)  # created, updated, deleted, validated
-    old_values = Column(JSON)  # Previous state
-    new_values = Column(JSON)  # New state
-    event_metadata = Column(JSON)    # Additional context
+    old_values = Column(JSONBType)  # Previous state
+    new_values = Column(JSONBType)  # New state
+    event_metadata = Column(JSONBType)    # Additional context
     
     # Result
-    success = Column(String(10), default="true")  # true, false
-    error_message = Column(Text)
+    success = Column(Boolean, default=True)
+    error_message = Column(String(2000))
     
     # Performance tracking
     execution_time_ms = Column(Integer)  # milliseconds
     
     # Error handling (Cahier des Charges)
-    fallback_used = Column(String(10), default="false")  # AI timeout fallback
+    fallback_used = Column(Boolean, default=False)  # AI timeout fallback
     retry_count = Column(Integer, default=0)
 
 class AICallLog(BaseModel):
@@ -51,11 +54,11 @@ class AICallLog(BaseModel):
     transaction_id = Column(String)
     
     # Result
-    success = Column(String(10), default="true")
-    error_message = Column(Text)
+    success = Column(Boolean, default=True)
+    error_message = Column(String(2000))
     confidence_score = Column(Float)
     
     # Hallucination detection
-    is_hallucination = Column(String(10), default="false")
+    is_hallucination = Column(Boolean, default=False)
     validation_status = Column(String(20))  # validated, rejected, pending
-    validated_by_user = Column(String(10), default="false")
\ No newline at end of file
+    validated_by_user = Column(Boolean, default=False)
\ No newline at end of file
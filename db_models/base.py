@@ -1,12 +1,23 @@
-from sqlalchemy import Column, String, DateTime, Integer, Float, Boolean, Text, Date, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, Float, Boolean, Text, Date, ForeignKey, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from database import Base
+from database import Base, engine
 import uuid
 
+# Postgres generates ids itself (gen_random_uuid, built in since PG 13 / pgcrypto before),
+# SQLite keeps the Python-side uuid4 default. Ids stay strings so existing String FKs still match.
+if engine.dialect.name == "postgresql":
+    _id_defaults = {"server_default": text("gen_random_uuid()::text")}
+else:
+    _id_defaults = {"default": lambda: str(uuid.uuid4())}
+
+# Binary, indexable JSON on Postgres; plain JSON elsewhere
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
 class BaseModel(Base):
     __abstract__ = True
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(String, primary_key=True, **_id_defaults)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
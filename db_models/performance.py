@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Integer, Float, JSON
-from db_models.base import BaseModel
+from sqlalchemy import Column, String, Integer, Float
+from db_models.base import BaseModel, JSONBType
 
 class PerformanceMetrics(BaseModel):
     """Performance metrics tracking for Cahier des Charges compliance"""
@@ -23,7 +23,7 @@ class PerformanceMetrics(BaseModel):
     ai_success_rate = Column(Float, default=0.0)  # Taux de succès des requêtes (%)
     ai_suggestion_quality = Column(Float, default=0.0)  # Qualité des suggestions (validation utilisateur)
     ai_hallucination_count = Column(Integer, default=0)  # Détection d'hallucinations
-    ai_resource_usage = Column(JSON)  # Utilisation des ressources
+    ai_resource_usage = Column(JSONBType)  # Utilisation des ressources
     
     # Validation metrics
     duplicate_matches_found = Column(Integer, default=0)
@@ -31,5 +31,5 @@ class PerformanceMetrics(BaseModel):
     debit_credit_imbalances = Column(Integer, default=0)
     
     # Alertes
-    alerts_generated = Column(JSON)  # List of alerts
+    alerts_generated = Column(JSONBType)  # List of alerts
     critical_errors = Column(Integer, default=0)
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Text, Boolean, JSON, DateTime, Index
 from sqlalchemy.orm import relationship
-from db_models.base import BaseModel
+from db_models.base import BaseModel, JSONBType
 
 class Reconciliation(BaseModel):
     __tablename__ = "reconciliations"
@@ -29,7 +29,7 @@ class Reconciliation(BaseModel):
     manual_interventions = Column(Integer, default=0)
     match_accuracy = Column(Float, default=0.0)  # percentage
     duplicate_count = Column(Integer, default=0)
-    validation_errors = Column(JSON)  # List of validation errors
+    validation_errors = Column(JSONBType)  # List of validation errors
     
     # Processing info
     status = Column(String(50), default="processing")  # processing, completed, failed
@@ -51,6 +51,15 @@ class Reconciliation(BaseModel):
 
 class Match(BaseModel):
     __tablename__ = "matches"
+    __table_args__ = (
+        Index("ix_matches_recon_status", "reconciliation_id", "status"),
+        # Results pages walk one reconciliation's matches in id order
+        Index("ix_matches_recon_id", "reconciliation_id", "id"),
+        Index("ix_matches_bank_transaction_id", "bank_transaction_id"),
+        Index("ix_matches_accounting_transaction_id", "accounting_transaction_id"),
+        # Leave page room so status flips stay HOT updates on Postgres
+        {"postgresql_with": {"fillfactor": 80}},
+    )
     
     reconciliation_id = Column(String, ForeignKey("reconciliations.id"), nullable=False)
     bank_transaction_id = Column(String, ForeignKey("bank_transactions.id"), nullable=False)
@@ -65,8 +74,8 @@ class Match(BaseModel):
     # Status and validation
     status = Column(String(50), default="matched")  # matched, validated, rejected, manual
     validated_by = Column(String(100))
-    validated_at = Column(String)
-    validation_comment = Column(Text)
+    validated_at = Column(DateTime(timezone=True), index=True)
+    validation_comment = Column(String(1000))
     
     # Group matching support
     is_group_match = Column(Boolean, default=False)
@@ -79,13 +88,17 @@ class Match(BaseModel):
 
 class SuspenseItem(BaseModel):
     __tablename__ = "suspense_items"
+    __table_args__ = (
+        Index("ix_suspense_items_recon_status", "reconciliation_id", "status"),
+        {"postgresql_with": {"fillfactor": 80}},
+    )
     
     reconciliation_id = Column(String, ForeignKey("reconciliations.id"), nullable=False)
     transaction_id = Column(String, nullable=False)  # ID of unmatched transaction
     transaction_type = Column(String(20), nullable=False)  # 'bank' or 'accounting'
     
     # Suspense details
-    reason = Column(Text, nullable=False)
+    reason = Column(String(500), nullable=False)
     suggested_category = Column(String(100))
     suggested_account = Column(String(20))  # PCN account suggestion
     ai_confidence = Column(Float)
@@ -93,8 +106,8 @@ class SuspenseItem(BaseModel):
     # Resolution
     status = Column(String(50), default="pending")  # pending, resolved, ignored
     resolved_by = Column(String(100))
-    resolved_at = Column(String)
-    resolution_comment = Column(Text)
+    resolved_at = Column(DateTime(timezone=True), index=True)
+    resolution_comment = Column(String(1000))
     
     # Relationships
     reconciliation = relationship("Reconciliation", back_populates="suspense_items")
\ No newline at end of file
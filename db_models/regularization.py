@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, Integer, ForeignKey, Text, Boolean, JSON
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Boolean, JSON
 from sqlalchemy.orm import relationship
 from db_models.base import BaseModel
 
@@ -10,7 +10,7 @@ class RegularizationEntry(BaseModel):
     # Entry details
     entry_number = Column(String(50), nullable=False)
     entry_date = Column(String(20), nullable=False)
-    description = Column(Text, nullable=False)
+    description = Column(String(500), nullable=False)
     
     # Entry lines stored as JSON for flexibility
     lines = Column(JSON, nullable=False)  # List of {account_code, account_name, debit, credit, description}
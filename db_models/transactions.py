@@ -1,9 +1,14 @@
-from sqlalchemy import Column, String, Float, Date, ForeignKey, Text
+from sqlalchemy import Column, String, Float, Date, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from db_models.base import BaseModel
 
 class BankTransaction(BaseModel):
     __tablename__ = "bank_transactions"
+    __table_args__ = (
+        Index("ix_bank_transactions_file_date", "file_id", "date"),
+        # Leave page room so status flips stay HOT updates on Postgres
+        {"postgresql_with": {"fillfactor": 80}},
+    )
     
     file_id = Column(String, ForeignKey("uploaded_files.id"), nullable=False)
     date = Column(Date, nullable=False)
@@ -24,6 +29,9 @@ class BankTransaction(BaseModel):
 
 class AccountingTransaction(BaseModel):
     __tablename__ = "accounting_transactions"
+    __table_args__ = (
+        Index("ix_accounting_transactions_file_date", "file_id", "date"),
+    )
     
     file_id = Column(String, ForeignKey("uploaded_files.id"), nullable=False)
     date = Column(Date, nullable=False)
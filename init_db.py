@@ -3,16 +3,19 @@
 Initialize database tables
 """
 
-from database import create_tables, engine
-from db_models.all_models import *
+from database import create_tables, make_script_engine
 import os
 
 def init_database():
     """Initialize database with all tables"""
+    # Imported here so importing this module doesn't build the whole model graph
+    import db_models.all_models  # registers models on Base.metadata
+    
     print("🗄️  Initializing database...")
+    engine = make_script_engine()
     
     # Create all tables
-    create_tables()
+    create_tables(bind=engine)
     
     print("✅ Database initialized successfully!")
     print(f"📍 Database location: {engine.url}")
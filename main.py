@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from routes.upload_routes import router as upload_router
 from routes.reconcile_routes import router as reconcile_router
@@ -15,7 +16,8 @@ os.makedirs("storage/reports", exist_ok=True)
 app = FastAPI(
     title="Rapprochement Bancaire API",
     description="Tunisian Bank Reconciliation System with AI Assistance",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -65,5 +67,19 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
+    from config import settings
     logger.info("Starting Rapprochement Bancaire API...")
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if settings.dev_reload:
+        # DEV=1: auto-reload, single process
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    else:
+        # uvloop + httptools when installed (uvicorn[standard]); WORKERS processes.
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=settings.workers,
+            loop="auto",
+            http="auto",
+            log_level="warning",
+        )
\ No newline at end of file
@@ -22,9 +22,10 @@ def migrate_database():
     print("🏗️  Creating/updating tables...")
     Base.metadata.create_all(bind=engine)
     
-    # Verify new tables
+    # Verify new tables: one bulk reflection call for every table's columns
     inspector = inspect(engine)
-    updated_tables = inspector.get_table_names()
+    columns_by_table = {table: columns for (_, table), columns in inspector.get_multi_columns().items()}
+    updated_tables = list(columns_by_table)
     
     print(f"✅ Migration complete!")
     print(f"📊 Total tables: {len(updated_tables)}")
@@ -39,8 +40,7 @@ def migrate_database():
     # Show all tables
     print(f"\n📋 All tables:")
     for table in sorted(updated_tables):
-        columns = inspector.get_columns(table)
-        print(f"   - {table} ({len(columns)} columns)")
+        print(f"   - {table} ({len(columns_by_table[table])} columns)")
 
 if __name__ == "__main__":
     migrate_database()
@@ -0,0 +1,41 @@
+"""
+Migration: Add indexes on the FK columns used by reconciliation joins and cascades
+"""
+from sqlalchemy import text
+from database import make_script_engine
+
+# (index name, table, columns) - kept in sync with the model __table_args__
+INDEXES = [
+    ("ix_bank_transactions_file_date", "bank_transactions", "file_id, date"),
+    ("ix_accounting_transactions_file_date", "accounting_transactions", "file_id, date"),
+    ("ix_matches_recon_status", "matches", "reconciliation_id, status"),
+    ("ix_matches_recon_id", "matches", "reconciliation_id, id"),
+    ("ix_matches_bank_transaction_id", "matches", "bank_transaction_id"),
+    ("ix_matches_accounting_transaction_id", "matches", "accounting_transaction_id"),
+    ("ix_suspense_items_recon_status", "suspense_items", "reconciliation_id, status"),
+]
+
+def upgrade():
+    """Create the indexes without blocking writes on Postgres"""
+    engine = make_script_engine()
+    concurrently = "CONCURRENTLY " if engine.dialect.name == "postgresql" else ""
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for name, table, columns in INDEXES:
+            conn.execute(text(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} ON {table} ({columns})"))
+            print(f"✓ {name}")
+
+def downgrade():
+    """Drop the indexes"""
+    engine = make_script_engine()
+    
+    with engine.begin() as conn:
+        for name, table, columns in INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        print("✓ Indexes removed")
+
+if __name__ == "__main__":
+    print("Running migration: add_hot_path_indexes")
+    upgrade()
+    print("Migration completed!")
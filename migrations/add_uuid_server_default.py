@@ -0,0 +1,51 @@
+"""
+Migration: Generate primary key ids on the database side (Postgres only)
+"""
+from sqlalchemy import text
+from database import make_script_engine
+
+TABLES = [
+    "uploaded_files",
+    "bank_transactions",
+    "accounting_transactions",
+    "reconciliations",
+    "matches",
+    "suspense_items",
+    "regularization_entries",
+    "audit_logs",
+    "ai_call_logs",
+    "users",
+    "performance_metrics",
+]
+
+def upgrade():
+    """Set gen_random_uuid() as the default for every id column"""
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        print("✓ Not Postgres, ids stay generated in Python")
+        return
+    
+    with engine.begin() as conn:
+        # gen_random_uuid() is built in from PG 13, pgcrypto provides it before that
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pgcrypto"))
+        for table in TABLES:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()::text"))
+            print(f"✓ {table}.id default set")
+
+def downgrade():
+    """Drop the database-side id defaults"""
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        return
+    
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT"))
+        print("✓ id defaults removed")
+
+if __name__ == "__main__":
+    print("Running migration: add_uuid_server_default")
+    upgrade()
+    print("Migration completed!")
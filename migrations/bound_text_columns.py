@@ -0,0 +1,50 @@
+"""
+Migration: Convert bounded TEXT columns to VARCHAR(n)
+"""
+from sqlalchemy import text
+from database import make_script_engine
+
+# (table, column, max length) - Reconciliation.error_message stays TEXT, it holds tracebacks
+BOUNDED_COLUMNS = [
+    ("audit_logs", "user_agent", 512),
+    ("audit_logs", "error_message", 2000),
+    ("ai_call_logs", "error_message", 2000),
+    ("matches", "validation_comment", 1000),
+    ("suspense_items", "reason", 500),
+    ("suspense_items", "resolution_comment", 1000),
+    ("regularization_entries", "description", 500),
+]
+
+def upgrade():
+    """Shrink TEXT columns to their VARCHAR bound, truncating longer values"""
+    engine = make_script_engine()
+    
+    # SQLite ignores declared lengths, nothing to alter
+    if engine.dialect.name != "postgresql":
+        print("✓ Not Postgres, column types unchanged")
+        return
+    
+    with engine.begin() as conn:
+        for table, column, length in BOUNDED_COLUMNS:
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR({length}) "
+                f"USING LEFT({column}, {length})"
+            ))
+            print(f"✓ {table}.{column} -> VARCHAR({length})")
+
+def downgrade():
+    """Revert columns to TEXT"""
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        return
+    
+    with engine.begin() as conn:
+        for table, column, length in BOUNDED_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TEXT"))
+        print("✓ Columns reverted")
+
+if __name__ == "__main__":
+    print("Running migration: bound_text_columns")
+    upgrade()
+    print("Migration completed!")
@@ -0,0 +1,58 @@
+"""
+Migration: Store audit/AI log flags as booleans instead of "true"/"false" strings
+"""
+from sqlalchemy import text
+from database import make_script_engine
+
+# (table, column, default)
+FLAG_COLUMNS = [
+    ("audit_logs", "success", "true"),
+    ("audit_logs", "fallback_used", "false"),
+    ("ai_call_logs", "success", "true"),
+    ("ai_call_logs", "is_hallucination", "false"),
+    ("ai_call_logs", "validated_by_user", "false"),
+]
+
+def upgrade():
+    """Convert string flag columns to BOOLEAN"""
+    engine = make_script_engine()
+    
+    with engine.begin() as conn:
+        for table, column, default in FLAG_COLUMNS:
+            if engine.dialect.name == "postgresql":
+                # The old string default can't be cast, so it is dropped and re-set around the type change
+                conn.execute(text(f"""
+                    ALTER TABLE {table}
+                        ALTER COLUMN {column} DROP DEFAULT,
+                        ALTER COLUMN {column} TYPE BOOLEAN USING ({column}::text IN ('true', 't', '1')),
+                        ALTER COLUMN {column} SET DEFAULT {default}
+                """))
+            else:
+                # SQLite columns are untyped, rewrite the stored strings as 0/1
+                conn.execute(text(
+                    f"UPDATE {table} SET {column} = CASE WHEN {column} IN ('true', '1') THEN 1 ELSE 0 END "
+                    f"WHERE typeof({column}) = 'text'"
+                ))
+            print(f"✓ {table}.{column} converted")
+
+def downgrade():
+    """Revert flag columns to VARCHAR(10)"""
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        return
+    
+    with engine.begin() as conn:
+        for table, column, default in FLAG_COLUMNS:
+            conn.execute(text(f"""
+                ALTER TABLE {table}
+                    ALTER COLUMN {column} DROP DEFAULT,
+                    ALTER COLUMN {column} TYPE VARCHAR(10) USING {column}::text,
+                    ALTER COLUMN {column} SET DEFAULT '{default}'
+            """))
+        print("✓ Columns reverted")
+
+if __name__ == "__main__":
+    print("Running migration: convert_audit_flags_to_boolean")
+    upgrade()
+    print("Migration completed!")
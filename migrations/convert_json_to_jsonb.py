@@ -0,0 +1,53 @@
+"""
+Migration: Store queried JSON columns as JSONB on Postgres
+"""
+from sqlalchemy import text
+from database import make_script_engine
+
+JSONB_COLUMNS = [
+    ("reconciliations", "validation_errors"),
+    ("performance_metrics", "ai_resource_usage"),
+    ("performance_metrics", "alerts_generated"),
+    ("audit_logs", "old_values"),
+    ("audit_logs", "new_values"),
+    ("audit_logs", "event_metadata"),
+]
+
+def upgrade():
+    """Convert JSON columns to JSONB and add a GIN index on audit metadata"""
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        print("✓ Not Postgres, JSON columns unchanged")
+        return
+    
+    with engine.begin() as conn:
+        for table, column in JSONB_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"))
+            print(f"✓ {table}.{column} converted")
+    
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_audit_logs_event_metadata "
+            "ON audit_logs USING gin (event_metadata)"
+        ))
+        print("✓ ix_audit_logs_event_metadata")
+
+def downgrade():
+    """Revert to JSON columns"""
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        return
+    
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_audit_logs_event_metadata"))
+        for table, column in JSONB_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSON USING {column}::json"))
+        print("✓ Columns reverted")
+
+if __name__ == "__main__":
+    print("Running migration: convert_json_to_jsonb")
+    upgrade()
+    print("Migration completed!")
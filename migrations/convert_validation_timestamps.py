@@ -0,0 +1,49 @@
+"""
+Migration: Store matches.validated_at / suspense_items.resolved_at as timestamps
+"""
+from sqlalchemy import text
+from database import make_script_engine
+
+COLUMNS = [
+    ("matches", "validated_at"),
+    ("suspense_items", "resolved_at"),
+]
+
+def _column_type(conn, table: str, column: str) -> str:
+    return conn.execute(
+        text("SELECT data_type FROM information_schema.columns WHERE table_name = :t AND column_name = :c"),
+        {"t": table, "c": column}
+    ).scalar()
+
+def upgrade():
+    """Convert ISO string columns to timestamptz and index them (already converted columns are skipped)"""
+    engine = make_script_engine()
+    
+    with engine.begin() as conn:
+        for table, column in COLUMNS:
+            # SQLite has no ALTER COLUMN TYPE, its ISO strings already compare in order
+            if engine.dialect.name == "postgresql" and _column_type(conn, table, column) != "timestamp with time zone":
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE TIMESTAMPTZ "
+                    f"USING NULLIF({column}, '')::timestamptz"
+                ))
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"))
+            print(f"✓ {table}.{column} converted and indexed")
+
+def downgrade():
+    """Revert to string columns"""
+    engine = make_script_engine()
+    
+    with engine.begin() as conn:
+        for table, column in COLUMNS:
+            conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_{column}"))
+            if engine.dialect.name == "postgresql":
+                conn.execute(text(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR USING {column}::text"
+                ))
+        print("✓ Columns reverted")
+
+if __name__ == "__main__":
+    print("Running migration: convert_validation_timestamps")
+    upgrade()
+    print("Migration completed!")
@@ -0,0 +1,51 @@
+"""
+Migration: Lower fillfactor on status-updated tables so updates stay HOT (Postgres only)
+"""
+from sqlalchemy import text
+from database import make_script_engine
+
+TABLES = ["matches", "suspense_items", "bank_transactions"]
+FILLFACTOR_OPTION = "fillfactor=80"  # as stored in pg_class.reloptions
+
+def upgrade():
+    """Set fillfactor=80 and rewrite existing pages to apply it
+
+    Tables already at fillfactor=80 are skipped: VACUUM FULL takes an ACCESS EXCLUSIVE lock
+    and rewrites the whole table, it must not run again on every migration run.
+    """
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        print("✓ Not Postgres, nothing to do")
+        return
+    
+    # VACUUM cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in TABLES:
+            reloptions = conn.execute(
+                text("SELECT reloptions FROM pg_class WHERE oid = to_regclass(:t)"), {"t": table}
+            ).scalar() or []
+            if FILLFACTOR_OPTION in reloptions:
+                print(f"✓ {table} already at fillfactor=80")
+                continue
+            conn.execute(text(f"ALTER TABLE {table} SET (fillfactor = 80)"))
+            # Only new pages honour the setting, VACUUM FULL repacks the existing ones
+            conn.execute(text(f"VACUUM FULL {table}"))
+            print(f"✓ {table} fillfactor=80")
+
+def downgrade():
+    """Restore the default fillfactor"""
+    engine = make_script_engine()
+    
+    if engine.dialect.name != "postgresql":
+        return
+    
+    with engine.begin() as conn:
+        for table in TABLES:
+            conn.execute(text(f"ALTER TABLE {table} RESET (fillfactor)"))
+        print("✓ fillfactor reset")
+
+if __name__ == "__main__":
+    print("Running migration: set_hot_update_fillfactor")
+    upgrade()
+    print("Migration completed!")
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, TypeAdapter
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
 
@@ -17,7 +18,12 @@ class MatchRule(str, Enum):
     AI_ASSISTED = "ai_assisted"
     MANUAL = "manual"
 
-class Transaction(BaseModel):
+# Internal reconciliation models: built once per row by the matching engine and never
+# parsed from a request, so plain slotted dataclasses instead of validated BaseModels.
+# The routes convert them with the module-level adapters below at the response boundary.
+
+@dataclass(slots=True)
+class Transaction:
     id: str
     date: str
     amount: float
@@ -27,28 +33,31 @@ class Transaction(BaseModel):
     value_date: Optional[str] = None
     category: Optional[str] = None
 
-class Match(BaseModel):
+@dataclass(slots=True)
+class Match:
     id: str
     bank_tx: Transaction
-    accounting_tx: Optional[Transaction] = None
-    accounting_txs: Optional[List[Transaction]] = None
     score: float
     rule: MatchRule
     status: MatchStatus
+    accounting_tx: Optional[Transaction] = None
+    accounting_txs: Optional[List[Transaction]] = None
     recon_id: Optional[str] = None
     account_code: Optional[str] = None
     validated_by: Optional[str] = None
     validated_at: Optional[datetime] = None
     ai_confidence: Optional[float] = None
 
-class SuspenseItem(BaseModel):
+@dataclass(slots=True)
+class SuspenseItem:
     transaction: Transaction
     type: str
     reason: str
     suggested_category: Optional[str] = None
     ai_confidence: Optional[float] = None
 
-class ReconciliationSummary(BaseModel):
+@dataclass(slots=True)
+class ReconciliationSummary:
     bank_total: float
     accounting_total: float
     matched_count: int
@@ -59,12 +68,16 @@ class ReconciliationSummary(BaseModel):
     opening_balance: float
     ai_assisted_matches: int = 0
 
-class ReconciliationResult(BaseModel):
+@dataclass(slots=True)
+class ReconciliationResult:
     summary: ReconciliationSummary
     matches: List[Match]
     suspense: List[SuspenseItem]
     metadata: Optional[Dict[str, Any]] = None
 
+# Built once at import; a TypeAdapter compiles its core schema on construction
+RECONCILIATION_SUMMARY_ADAPTER = TypeAdapter(ReconciliationSummary)
+
 class UploadData(BaseModel):
     id: str
     filename: str
@@ -89,6 +102,7 @@ class ReconcileRequest(BaseModel):
     bank_file: str
     accounting_file: str
     rules: Optional[ReconciliationRules] = None
+    background: bool = False  # True: return the job id immediately, run the matching after the response
 
 class MatchValidation(BaseModel):
     action: str
@@ -102,4 +116,15 @@ class CategoryRequest(BaseModel):
     description: str
 
 class PCNRequest(BaseModel):
-    account_code: str
\ No newline at end of file
+    account_code: str
+
+# Structured extraction output expected back from Claude (amounts may come back as Tunisian text)
+class AITransaction(BaseModel):
+    date: str
+    description: str
+    amount: Union[float, str]
+    type: Optional[str] = None
+    solde_progressif: Optional[Union[float, str]] = None
+
+class AITransactionsResponse(BaseModel):
+    transactions: List[AITransaction]
@@ -2,55 +2,26 @@
 AI-Powered PDF Parser - Fallback layer when traditional parsing fails
 Uses Claude API to intelligently extract transaction data
 """
-import os
 import re
-import json
+import os
+import orjson
+import time
+import hashlib
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import uuid
-from typing import Optional
-try:
-    import anthropic
-except ImportError:
-    anthropic = None
+from typing import List, Optional
+from config import settings, CACHE_DIR, AI_CACHE_TTL_SECONDS
+from utils.helpers import generate_unique_ids
+from utils.logger import logger
 
-class AIPDFParser:
-    """AI-powered parser using Claude for complex PDFs"""
-    
-    def __init__(self):
-        self.api_key = os.getenv('ANTHROPIC_API_KEY')
-        self.client = anthropic.Anthropic(api_key=self.api_key) if anthropic and self.api_key else None
-    
-    def parse_with_ai(self, text: str, file_type: str) -> Optional[pd.DataFrame]:
-        """Use AI to parse extracted text when traditional methods fail"""
-        if not self.client:
-            print("DEBUG: Claude API not available, skipping AI parsing")
-            return None
-        
-        print(f"DEBUG: Attempting AI parsing for {file_type}")
-        
-        try:
-            if file_type == 'bank':
-                prompt = self._create_bank_prompt(text[:8000])  # Limit text size
-            else:
-                prompt = self._create_accounting_prompt(text[:8000])
-            
-            response = self.client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=4000,
-                temperature=0,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            content = response.content[0].text
-            return self._parse_ai_response(content, file_type)
-            
-        except Exception as e:
-            print(f"DEBUG: AI parsing failed: {str(e)}")
-            return None
-    
-    def _create_bank_prompt(self, text: str) -> str:
-        """Create prompt for bank statement parsing"""
-        return f"""Extract ALL transactions from this BIAT bank statement text.
+# Text is sent in chunks cut at line boundaries, one concurrent request per chunk
+AI_CHUNK_CHARS = 6000
+AI_MAX_CHUNKS = 8
+# Output budget per chunk (a 6k-char chunk rarely yields more than this)
+AI_MAX_TOKENS = 1500
+
+BANK_INSTRUCTIONS = """Extract ALL transactions from the BIAT bank statement text provided.
 
 Format patterns to look for:
 1. Balance: "SOLDE AU 31 07 2025 1.177.437,649"
@@ -64,15 +35,10 @@ Rules:
 - Extract complete descriptions
 - Identify transaction type (balance/transaction/commission)
 
-Text:
-{text}
-
 Return ONLY valid JSON (no markdown):
-{{"transactions": [{{"date": "YYYY-MM-DD", "description": "text", "amount": number, "type": "balance|transaction|commission"}}]}}"""
-    
-    def _create_accounting_prompt(self, text: str) -> str:
-        """Create prompt for grand livre parsing"""
-        return f"""Extract ALL transactions from this Tunisian grand livre (general ledger).
+{"transactions": [{"date": "YYYY-MM-DD", "description": "text", "amount": number, "type": "balance|transaction|commission"}]}"""
+
+ACCOUNTING_INSTRUCTIONS = """Extract ALL transactions from the Tunisian grand livre (general ledger) text provided.
 
 Format patterns:
 1. "010825 5607 1000 MCC 3 462.900 -3 462.900"
@@ -87,34 +53,142 @@ Rules:
 - Examples: "249.697,875" → 249697.875, "3.462,900" → 3462.9
 - Skip header rows
 
-Text:
-{text}
-
 Return ONLY valid JSON (no markdown):
-{{"transactions": [{{"date": "YYYY-MM-DD", "description": "text", "amount": number, "solde_progressif": number}}]}}"""
+{"transactions": [{"date": "YYYY-MM-DD", "description": "text", "amount": number, "solde_progressif": number}]}"""
+
+def split_text_chunks(text: str, chunk_chars: int = AI_CHUNK_CHARS) -> List[str]:
+    """Split text into chunks of at most chunk_chars, never cutting a line"""
+    chunks, current, size = [], [], 0
+    for line in text.split('\n'):
+        if current and size + len(line) + 1 > chunk_chars:
+            chunks.append('\n'.join(current))
+            current, size = [], 0
+        current.append(line[:chunk_chars])
+        size += len(line) + 1
+    if current:
+        chunks.append('\n'.join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+def _cache_path(text: str, file_type: str) -> str:
+    key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"ai_{file_type}_{key}.json")
+
+def _load_cached_transactions(path: str) -> Optional[List[dict]]:
+    """Cached transactions for this text, or None if missing/expired/unreadable"""
+    try:
+        if time.time() - os.path.getmtime(path) > AI_CACHE_TTL_SECONDS:
+            return None
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+def _store_cached_transactions(path: str, transactions: List[dict]):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(transactions))
+        os.replace(tmp_path, path)  # atomic, concurrent readers never see a partial file
+    except OSError as e:
+        logger.warning("Could not write AI cache: %s", e)
+
+class AIPDFParser:
+    """AI-powered parser using Claude for complex PDFs"""
+    
+    def __init__(self):
+        self.api_key = settings.anthropic_api_key
+        self._client = None
+    
+    @property
+    def client(self):
+        """AsyncAnthropic client, created (and the SDK imported) on first use; None if unavailable"""
+        if self._client is None and self.api_key:
+            try:
+                import anthropic
+            except ImportError:
+                return None
+            self._client = anthropic.AsyncAnthropic(api_key=self.api_key)
+        return self._client
     
-    def _parse_ai_response(self, content: str, file_type: str) -> Optional[pd.DataFrame]:
-        """Parse AI response and convert to DataFrame"""
+    def parse_with_ai(self, text: str, file_type: str) -> Optional[pd.DataFrame]:
+        """Use AI to parse extracted text when traditional methods fail (sync entry point)"""
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if not json_match:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.parse_with_ai_async(text, file_type))
+        # Already inside an event loop: run on a private loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.parse_with_ai_async(text, file_type)).result()
+    
+    async def parse_with_ai_async(self, text: str, file_type: str) -> Optional[pd.DataFrame]:
+        """Send the text in line-aligned chunks concurrently and merge the extracted transactions"""
+        # Identical text (re-uploaded PDF) -> reuse the previous answer, no API call
+        cache_path = _cache_path(text, file_type)
+        transactions = _load_cached_transactions(cache_path)
+        if transactions:
+            logger.debug("AI cache hit for %s", file_type)
+        else:
+            if not self.client:
+                logger.debug("Claude API not available, skipping AI parsing")
                 return None
             
-            data = json.loads(json_match.group())
-            transactions = data.get('transactions', [])
+            chunks = split_text_chunks(text)[:AI_MAX_CHUNKS]
+            logger.debug("Attempting AI parsing for %s (%d chunks)", file_type, len(chunks))
+            
+            results = await asyncio.gather(*(self._parse_chunk(chunk, file_type) for chunk in chunks))
+            failed_chunks = sum(chunk_transactions is None for chunk_transactions in results)
+            transactions = [tx for chunk_transactions in results if chunk_transactions for tx in chunk_transactions]
             
             if not transactions:
                 return None
+            if failed_chunks:
+                # Partial statement: usable for this upload, but never cached as the answer for this text
+                logger.warning("AI parsing: %d/%d chunks failed, result not cached", failed_chunks, len(chunks))
+            else:
+                _store_cached_transactions(cache_path, transactions)
+        
+        # Add IDs
+        for tx, tx_id in zip(transactions, generate_unique_ids(len(transactions))):
+            tx['id'] = tx_id
+        
+        df = pd.DataFrame(transactions)
+        logger.debug("AI extracted %d transactions", len(df))
+        return df
+    
+    async def _parse_chunk(self, text: str, file_type: str) -> Optional[List[dict]]:
+        """One streamed request for a chunk; None if the request or its response failed"""
+        try:
+            instructions = BANK_INSTRUCTIONS if file_type == 'bank' else ACCOUNTING_INSTRUCTIONS
+            
+            # Every chunk shares the static instructions, sent as the system prompt
+            async with self.client.messages.stream(
+                model="claude-3-haiku-20240307",
+                max_tokens=AI_MAX_TOKENS,
+                temperature=0,
+                system=instructions,
+                messages=[{"role": "user", "content": f"Text:\n{text}"}]
+            ) as stream:
+                content = await stream.get_final_text()
             
-            # Add IDs
-            for tx in transactions:
-                tx['id'] = str(uuid.uuid4())
+            return self._parse_ai_response(content)
+            
+        except Exception as e:
+            logger.warning("AI parsing failed for a %d-char chunk: %s", len(text), e)
+            return None
+    
+    def _parse_ai_response(self, content: str) -> Optional[List[dict]]:
+        """Extract the transaction list from an AI response, None if it isn't valid JSON"""
+        try:
+            # Extract JSON from response (handle markdown code blocks)
+            json_match = re.search(r'\{.*\}', content, re.DOTALL)
+            if not json_match:
+                logger.warning("AI response contains no JSON object")
+                return None
             
-            df = pd.DataFrame(transactions)
-            print(f"DEBUG: AI extracted {len(df)} transactions")
-            return df
+            data = orjson.loads(json_match.group())
+            return data.get('transactions', []) or []
             
         except Exception as e:
-            print(f"DEBUG: Failed to parse AI response: {str(e)}")
+            logger.warning("Failed to parse AI response: %s", e)
             return None
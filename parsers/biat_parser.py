@@ -1,11 +1,125 @@
 import re
-import pdfplumber
 import pandas as pd
+import numpy as np
 from typing import List, Dict
-import uuid
 import io
+import os
+from concurrent.futures import ProcessPoolExecutor
 from parsers.ai_parser import AIPDFParser
 from services.tunisian_config import TunisianBankConfig
+from utils.helpers import generate_unique_ids
+from utils.logger import logger
+
+# Single anchored scanner for BIAT statement lines, compiled once.
+# Branches are tried in order; the outer named group that matched is m.lastgroup.
+#   solde: "SOLDE AU 31 07 2025 1.177.437,649" (anywhere in the line, case-insensitive)
+#   eng:   "01 08 ENG/SIGNATURE R0010350 01082025 3,800"
+#   tx:    "01 08 REGLEMENT CHEQUE 0001294 31072025 7.908,050"
+_BANK_LINE_PATTERN = (
+    r'(?:.*?(?P<solde>(?i:SOLDE\s+AU)\s+(?P<s_day>\d{2})\s+(?P<s_month>\d{2})\s+(?P<s_year>\d{4})\s+(?P<s_amount>[\d\.,]+)))'
+    r'|(?P<eng>(?P<e_day>\d{2})\s+(?P<e_month>\d{2})\s+(?P<e_desc>ENG/SIGNATURE\s+\w+)\s+(?P<e_date>\d{8})\s+(?P<e_amount>[\d\.,]+)$)'
+    r'|(?P<tx>(?P<t_day>\d{2})\s+(?P<t_month>\d{2})\s+(?P<t_desc>.+?)\s+(?P<t_date>\d{8})\s+(?P<t_amount>[\d\.,]+)$)'
+)
+BANK_LINE_RE = re.compile(_BANK_LINE_PATTERN)
+# Same scanner applied to a whole page in one finditer pass (no per-line split/strip/match
+# in Python). Anchored per line with re.M, and whitespace restricted to [^\S\n] so a match
+# never spans two lines; equivalent to BANK_LINE_RE.match on each stripped line.
+BANK_PAGE_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    + _BANK_LINE_PATTERN.replace(r'\s', r'[^\S\n]').replace('$)', r'[^\S\n]*$)')
+    + ')',
+    re.M
+)
+TUNISIAN_AMOUNT_RE = re.compile(r'([\d\.]+,[\d]+)')
+AMOUNT_TOKEN_RE = re.compile(r'[\d\.,]+')
+SLASH_DATE_RE = re.compile(r'\d{2}/\d{2}/\d{4}')
+
+# Header keywords to skip (grand livre)
+HEADER_KEYWORDS = ('date', 'libellé', 'libelle', 'débit', 'debit', 'crédit', 'credit',
+                   'solde', 'n°pièce', 'n°piece', 'piece', 'compte', 'total')
+
+# Résolu une fois à l'import plutôt qu'à chaque montant
+_normalize_amount = TunisianBankConfig.normalize_tunisian_amount
+
+# En dessous de ce nombre de pages, le coût de démarrage du pool dépasse le gain
+PARALLEL_PAGE_THRESHOLD = 4
+
+def _page_text(page) -> str:
+    return page.extract_text(**TunisianBankConfig.PDF_TEXT_OPTIONS)
+
+# En-têtes des 5 colonnes du grand livre, dans l'ordre attendu par parse_grand_livre
+GRAND_LIVRE_HEADERS = (
+    ('date',),
+    ('libellé', 'libelle'),
+    ('débit', 'debit'),
+    ('crédit', 'credit'),
+    ('solde',),
+)
+
+def _grand_livre_rows_from_words(page) -> list:
+    """
+    Reconstruit les lignes du tableau à partir des mots et de la position des en-têtes.
+    Beaucoup moins coûteux que extract_tables (pas de détection de traits/rectangles).
+    Retourne None si la ligne d'en-tête n'est pas trouvée sur la page.
+    """
+    words = page.extract_words(x_tolerance=3, y_tolerance=3)
+    
+    header_top, starts = None, []
+    for keywords in GRAND_LIVRE_HEADERS:
+        word = next((w for w in words if w['text'].lower() in keywords
+                     and (header_top is None or abs(w['top'] - header_top) <= 3)), None)
+        if word is None:
+            return None
+        header_top = word['top'] if header_top is None else header_top
+        starts.append(word['x0'])
+    
+    # Un mot appartient à la dernière colonne dont l'en-tête commence avant sa fin (x1):
+    # couvre le texte aligné à gauche comme les montants alignés à droite
+    bounds = starts[1:]
+    
+    lines = {}
+    for w in words:
+        if w['top'] <= header_top + 3:
+            continue
+        column = sum(1 for bound in bounds if w['x1'] > bound)
+        lines.setdefault(round(w['top']), [[] for _ in GRAND_LIVRE_HEADERS])[column].append(w['text'])
+    
+    return [
+        [' '.join(cell) or None for cell in cells]
+        for _, cells in sorted(lines.items())
+    ]
+
+def _page_tables(page) -> list:
+    rows = _grand_livre_rows_from_words(page)
+    if rows is not None:
+        return [rows]
+    # Mise en page inconnue: détection générique des tableaux
+    return page.extract_tables()
+
+def _extract_page_range(pdf_content: bytes, extract, start: int, stop: int) -> list:
+    """Worker: ouvre le PDF une fois et extrait les pages [start, stop)"""
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+        return [extract(page) for page in pdf.pages[start:stop]]
+
+def _extract_pages(pdf_content: bytes, pdf, extract) -> list:
+    """
+    Applique extract à chaque page, dans l'ordre.
+    pdfplumber est du pur Python (CPU-bound), donc au-delà du seuil les pages
+    sont réparties par plages contiguës sur un pool de processus.
+    """
+    page_count = len(pdf.pages)
+    if page_count < PARALLEL_PAGE_THRESHOLD:
+        return [extract(page) for page in pdf.pages]
+    
+    workers = min(os.cpu_count() or 1, page_count)
+    step = -(-page_count // workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_extract_page_range, pdf_content, extract, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        return [result for future in futures for result in future.result()]
 
 class BIATPDFParser:
     """Parser spécifique pour les relevés BIAT Tunisie"""
@@ -17,146 +131,98 @@ class BIATPDFParser:
         Format attendu : 
         01 08 REGLEMENT CHEQUE 0001294 31072025 7.908,050
         """
-        print(f"DEBUG: Starting BIAT bank statement parsing, content size: {len(pdf_content)} bytes")
-        transactions = []
+        import pdfplumber
+        logger.debug("Starting BIAT bank statement parsing, content size: %d bytes", len(pdf_content))
+        # Une liste par colonne plutôt qu'un dict par ligne (DataFrame construit colonne par colonne)
+        dates, descriptions, amounts, pages, types = [], [], [], [], []
+        # Bound once instead of an attribute lookup per page/line
+        scan_page = BANK_PAGE_RE.finditer
+        normalize = _normalize_amount
         
         try:
             with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                print(f"DEBUG: PDF opened successfully, {len(pdf.pages)} pages found")
-            for page_num, page in enumerate(pdf.pages):
-                text = page.extract_text()
+                logger.debug("PDF opened successfully, %d pages found", len(pdf.pages))
+                # Textes des pages extraits une seule fois, réutilisés par les fallbacks
+                page_texts = [text or "" for text in _extract_pages(pdf_content, pdf, _page_text)]
+            
+            for page_num, text in enumerate(page_texts):
                 if not text:
                     continue
                 
-                # Séparer par lignes
-                lines = text.split('\n')
-                
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # 1. EXTRAIRE LE SOLDE (format: "SOLDE AU 31 07 2025 1.177.437,649")
-                    solde_match = re.search(
-                        r'SOLDE\s+AU\s+(\d{2})\s+(\d{2})\s+(\d{4})\s+([\d\.,]+)',
-                        line, 
-                        re.IGNORECASE
-                    )
-                    if solde_match:
-                        day, month, year, amount_str = solde_match.groups()
-                        amount = TunisianBankConfig.normalize_tunisian_amount(amount_str)
-                        transactions.append({
-                            'id': str(uuid.uuid4()),
-                            'date': f"{year}-{month}-{day}",
-                            'description': f"SOLDE AU {day}/{month}/{year}",
-                            'amount': amount,
-                            'page': page_num + 1,
-                            'type': 'balance'
-                        })
-                        continue
-                    
-                    # 2. EXTRAIRE LES TRANSACTIONS RÉGULIÈRES
-                    # Format: "01 08 REGLEMENT CHEQUE 0001294 31072025 7.908,050"
-                    # Structure: jour mois description date_comptable montant
-                    tx_pattern = r'^(\d{2})\s+(\d{2})\s+(.+?)\s+(\d{8})\s+([\d\.,]+)$'
-                    tx_match = re.match(tx_pattern, line)
+                for m in scan_page(text):
+                    kind = m.lastgroup
                     
-                    if tx_match:
-                        day, month, desc, tx_date, amount_str = tx_match.groups()
-                        amount = TunisianBankConfig.normalize_tunisian_amount(amount_str)
-                        
-                        # Convertir la date comptable (DDMMYYYY) en format ISO
-                        if len(tx_date) == 8:
-                            d_day = tx_date[:2]
-                            d_month = tx_date[2:4]
-                            d_year = tx_date[4:]
-                            iso_date = f"{d_year}-{d_month}-{d_day}"
-                        else:
-                            iso_date = f"2025-{month}-{day}"
-                        
-                        transactions.append({
-                            'id': str(uuid.uuid4()),
-                            'date': iso_date,
-                            'description': desc.strip(),
-                            'amount': amount,
-                            'page': page_num + 1,
-                            'type': 'transaction'
-                        })
+                    # 1. SOLDE (format: "SOLDE AU 31 07 2025 1.177.437,649")
+                    if kind == 'solde':
+                        day, month, year = m.group('s_day', 's_month', 's_year')
+                        dates.append(f"{year}-{month}-{day}")
+                        descriptions.append(f"SOLDE AU {day}/{month}/{year}")
+                        amounts.append(normalize(m.group('s_amount')))
+                        pages.append(page_num + 1)
+                        types.append('balance')
                         continue
                     
-                    # 3. EXTRAIRE LES COMMISSIONS (ENG/SIGNATURE)
-                    # Format: "01 08 ENG/SIGNATURE R0010350 01082025 3,800"
-                    eng_pattern = r'^(\d{2})\s+(\d{2})\s+(ENG/SIGNATURE\s+\w+)\s+(\d{8})\s+([\d\.,]+)$'
-                    eng_match = re.match(eng_pattern, line)
+                    # 2. COMMISSIONS (ENG/SIGNATURE) / 3. TRANSACTIONS RÉGULIÈRES
+                    # Structure: jour mois description date_comptable(DDMMYYYY) montant
+                    if kind == 'eng':
+                        desc, tx_date, amount_str = m.group('e_desc', 'e_date', 'e_amount')
+                        tx_type = 'commission'
+                    else:
+                        desc, tx_date, amount_str = m.group('t_desc', 't_date', 't_amount')
+                        tx_type = 'transaction'
                     
-                    if eng_match:
-                        day, month, desc, tx_date, amount_str = eng_match.groups()
-                        amount = TunisianBankConfig.normalize_tunisian_amount(amount_str)
-                        
-                        # Convertir la date
-                        if len(tx_date) == 8:
-                            d_day = tx_date[:2]
-                            d_month = tx_date[2:4]
-                            d_year = tx_date[4:]
-                            iso_date = f"{d_year}-{d_month}-{d_day}"
-                        else:
-                            iso_date = f"2025-{month}-{day}"
-                        
-                        transactions.append({
-                            'id': str(uuid.uuid4()),
-                            'date': iso_date,
-                            'description': desc.strip(),
-                            'amount': amount,
-                            'page': page_num + 1,
-                            'type': 'commission'
-                        })
+                    dates.append(f"{tx_date[4:]}-{tx_date[2:4]}-{tx_date[:2]}")
+                    descriptions.append(desc.strip())
+                    amounts.append(normalize(amount_str))
+                    pages.append(page_num + 1)
+                    types.append(tx_type)
             
-            print(f"DEBUG: Extracted {len(transactions)} transactions from bank statement")
+            logger.debug("Extracted %d transactions from bank statement", len(amounts))
             
-            if not transactions:
-                print("DEBUG: No transactions found with regex patterns, trying AI parsing")
+            if not amounts:
+                logger.debug("No transactions found with regex patterns, trying AI parsing")
                 # Try AI parsing as fallback
                 ai_parser = AIPDFParser()
-                with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                    full_text = "\n".join([page.extract_text() or "" for page in pdf.pages[:5]])
-                    ai_result = ai_parser.parse_with_ai(full_text, 'bank')
-                    if ai_result is not None and not ai_result.empty:
-                        print(f"DEBUG: AI parsing successful: {len(ai_result)} transactions")
-                        return ai_result
+                full_text = "\n".join(page_texts[:5])
+                ai_result = ai_parser.parse_with_ai(full_text, 'bank')
+                if ai_result is not None and not ai_result.empty:
+                    logger.debug("AI parsing successful: %d transactions", len(ai_result))
+                    return ai_result
                 
-                print("DEBUG: AI parsing failed, trying simple extraction")
+                logger.warning("AI parsing failed, trying simple extraction")
                 # Fallback: extract any line with amounts
-                with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                    for page_num, page in enumerate(pdf.pages):
-                        text = page.extract_text()
-                        if text:
-                            lines = text.split('\n')
-                            for line in lines:
-                                # Look for any line with a Tunisian amount pattern
-                                amount_matches = re.findall(r'([\d\.]+,[\d]+)', line)
-                                if amount_matches:
-                                    amount_str = amount_matches[-1]  # Take last amount on line
-                                    try:
-                                        amount = TunisianBankConfig.normalize_tunisian_amount(amount_str)
-                                        if amount > 0:
-                                            transactions.append({
-                                                'id': str(uuid.uuid4()),
-                                                'date': '2025-08-01',  # Default date
-                                                'description': line.strip()[:100],
-                                                'amount': amount,
-                                                'page': page_num + 1,
-                                                'type': 'transaction'
-                                            })
-                                    except:
-                                        continue
-                print(f"DEBUG: Fallback extraction found {len(transactions)} transactions")
+                for page_num, text in enumerate(page_texts):
+                    for line in text.split('\n'):
+                        # Look for any line with a Tunisian amount pattern
+                        amount_matches = TUNISIAN_AMOUNT_RE.findall(line)
+                        if amount_matches:
+                            amount_str = amount_matches[-1]  # Take last amount on line
+                            try:
+                                amount = normalize(amount_str)
+                                if amount > 0:
+                                    dates.append('2025-08-01')  # Default date
+                                    descriptions.append(line.strip()[:100])
+                                    amounts.append(amount)
+                                    pages.append(page_num + 1)
+                                    types.append('transaction')
+                            except:
+                                continue
+                logger.debug("Fallback extraction found %d transactions", len(amounts))
             
-            if not transactions:
+            if not amounts:
                 raise ValueError("Aucune transaction extraite du PDF BIAT - le format ne correspond pas")
             
-            return pd.DataFrame(transactions)
+            df = pd.DataFrame({
+                'date': dates,
+                'description': descriptions,
+                'amount': np.array(amounts, dtype=np.float64),
+                'page': np.array(pages, dtype=np.int64),
+                'type': types
+            })
+            df.insert(0, 'id', generate_unique_ids(len(df)))
+            return df
         except Exception as e:
-            print(f"DEBUG: Error parsing bank statement: {str(e)}")
+            logger.warning("Error parsing bank statement: %s", e)
             raise
     
     @staticmethod
@@ -165,76 +231,51 @@ class BIATPDFParser:
         Parse le grand livre PDF spécifique
         Format: Tableau avec colonnes Date, Description, Débit, Crédit, Solde
         """
-        print(f"DEBUG: Starting Grand Livre parsing, content size: {len(pdf_content)} bytes")
+        import pdfplumber
+        logger.debug("Starting Grand Livre parsing, content size: %d bytes", len(pdf_content))
         transactions = []
-        
-        # Header keywords to skip
-        header_keywords = ['date', 'libellé', 'libelle', 'débit', 'debit', 'crédit', 'credit', 
-                          'solde', 'n°pièce', 'n°piece', 'piece', 'compte', 'total']
+        # Lignes de tableau brutes, converties en une seule passe vectorisée après la boucle
+        raw_rows = []
+        normalize = _normalize_amount
+        find_amounts = AMOUNT_TOKEN_RE.findall
+        search_date = SLASH_DATE_RE.search
         
         with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-            print(f"DEBUG: Grand Livre PDF opened, {len(pdf.pages)} pages found")
-            for page_num, page in enumerate(pdf.pages):
-                # Essayer d'extraire les tables
-                tables = page.extract_tables()
-                
+            logger.debug("Grand Livre PDF opened, %d pages found", len(pdf.pages))
+            # Essayer d'extraire les tables
+            page_tables = _extract_pages(pdf_content, pdf, _page_tables)
+            for page_num, tables in enumerate(page_tables):
                 for table in tables:
-                    for row_idx, row in enumerate(table):
+                    for row in table:
                         if len(row) >= 5:  # Au moins Date, Description, Débit, Crédit, Solde
                             date, description, debit, credit, solde = row[:5]
                             
                             # Skip header rows
-                            if date and any(keyword in str(date).lower() for keyword in header_keywords):
+                            if date and any(keyword in str(date).lower() for keyword in HEADER_KEYWORDS):
                                 continue
-                            if description and any(keyword in str(description).lower() for keyword in header_keywords):
+                            if description and any(keyword in str(description).lower() for keyword in HEADER_KEYWORDS):
                                 continue
                             
                             # Skip rows without valid data
                             if not date or (not debit and not credit and not solde):
                                 continue
                             
-                            try:
-                                # Nettoyer les valeurs
-                                date = str(date).strip() if date else ""
-                                description = str(description).strip() if description else ""
-                                
-                                # Parse amounts safely
-                                debit = TunisianBankConfig.normalize_tunisian_amount(str(debit)) if debit and str(debit).strip() else 0
-                                credit = TunisianBankConfig.normalize_tunisian_amount(str(credit)) if credit and str(credit).strip() else 0
-                                solde_val = TunisianBankConfig.normalize_tunisian_amount(str(solde)) if solde and str(solde).strip() else 0
-                                
-                                # Déterminer le montant (débit positif, crédit négatif)
-                                amount = debit if debit > 0 else -credit if credit > 0 else solde_val
-                                
-                                transactions.append({
-                                    'id': str(uuid.uuid4()),
-                                    'date': date,
-                                    'description': description,
-                                    'debit': debit,
-                                    'credit': credit,
-                                    'amount': amount,
-                                    'solde_progressif': solde_val,
-                                    'page': page_num + 1
-                                })
-                            except ValueError as e:
-                                # Skip rows that can't be parsed
-                                print(f"DEBUG: Skipping row {row_idx} on page {page_num + 1}: {str(e)}")
-                                continue
+                            raw_rows.append((date, description, debit, credit, solde, page_num + 1))
                 
                 # Fallback 1: extraction par texte si pas de tables
-                if not transactions:
-                    text = page.extract_text()
+                if not raw_rows and not transactions:
+                    text = pdf.pages[page_num].extract_text(**TunisianBankConfig.PDF_TEXT_OPTIONS)
                     if text:
                         # Chercher les lignes de transaction
                         lines = text.split('\n')
                         for line in lines:
                             # Chercher des montants dans la ligne
-                            amounts = re.findall(r'[\d\.,]+', line)
+                            amounts = find_amounts(line)
                             if len(amounts) >= 3:
-                                solde_val = BIATPDFParser._parse_tunisian_amount(amounts[-1])
+                                solde_val = normalize(amounts[-1])
                                 
                                 # Chercher une date
-                                date_match = re.search(r'\d{2}/\d{2}/\d{4}', line)
+                                date_match = search_date(line)
                                 date = date_match.group(0) if date_match else ""
                                 
                                 # Extraire la description
@@ -243,7 +284,6 @@ class BIATPDFParser:
                                 description = line[desc_start:desc_end].strip()
                                 
                                 transactions.append({
-                                    'id': str(uuid.uuid4()),
                                     'date': date,
                                     'description': description,
                                     'amount': solde_val,
@@ -251,25 +291,54 @@ class BIATPDFParser:
                                     'page': page_num + 1
                                 })
         
-        print(f"DEBUG: Extracted {len(transactions)} transactions from grand livre")
+        if raw_rows:
+            transactions.extend(BIATPDFParser._grand_livre_rows_to_records(raw_rows))
+        
+        logger.debug("Extracted %d transactions from grand livre", len(transactions))
         
         if not transactions or len(transactions) < 10:
-            print("DEBUG: Too few transactions, trying AI parsing")
+            logger.debug("Too few transactions, trying AI parsing")
             # Try AI parsing as fallback
             ai_parser = AIPDFParser()
             with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                full_text = "\n".join([page.extract_text() or "" for page in pdf.pages])
+                full_text = "\n".join([page.extract_text(**TunisianBankConfig.PDF_TEXT_OPTIONS) or "" for page in pdf.pages])
                 ai_result = ai_parser.parse_with_ai(full_text, 'accounting')
                 if ai_result is not None and len(ai_result) > len(transactions):
-                    print(f"DEBUG: AI parsing better: {len(ai_result)} vs {len(transactions)} transactions")
+                    logger.debug("AI parsing better: %d vs %d transactions", len(ai_result), len(transactions))
                     return ai_result
         
         if not transactions:
             raise ValueError("Aucune transaction extraite du grand livre")
         
-        return pd.DataFrame(transactions)
+        df = pd.DataFrame(transactions).sort_values('page', kind='stable', ignore_index=True)
+        df.insert(0, 'id', generate_unique_ids(len(df)))
+        return df
+    
+    @staticmethod
+    def _grand_livre_rows_to_records(raw_rows: list) -> List[Dict]:
+        """Convertit les lignes brutes du grand livre en une passe vectorisée (montants tunisiens)"""
+        df = pd.DataFrame(raw_rows, columns=['date', 'description', 'debit', 'credit', 'solde_progressif', 'page'])
+        df['date'] = df['date'].astype(str).str.strip()
+        df['description'] = df['description'].fillna('').astype(str).str.strip()
+        
+        for col in ('debit', 'credit', 'solde_progressif'):
+            # Même nettoyage que normalize_tunisian_amount: 1.234,567 -> 1234.567
+            cleaned = (
+                df[col].fillna('').astype(str)
+                .str.replace(r' |TND|DT|None', '', regex=True)
+                .str.replace('.', '', regex=False)
+                .str.replace(',', '.', regex=False)
+            )
+            df[col] = pd.to_numeric(cleaned, errors='coerce').fillna(0.0)
+        
+        # Débit positif, crédit négatif, sinon le solde
+        df['amount'] = np.where(
+            df['debit'] > 0, df['debit'],
+            np.where(df['credit'] > 0, -df['credit'], df['solde_progressif'])
+        )
+        return df[['date', 'description', 'debit', 'credit', 'amount', 'solde_progressif', 'page']].to_dict('records')
     
     @staticmethod
     def _parse_tunisian_amount(amount_str: str) -> float:
         """Convertit un montant tunisien (1.234,56) en float"""
-        return TunisianBankConfig.normalize_tunisian_amount(amount_str)
+        return _normalize_amount(amount_str)
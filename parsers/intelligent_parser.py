@@ -2,12 +2,165 @@ from enum import Enum
 import pandas as pd
 from typing import Optional, Dict, Any
 import base64
-import json
 import re
-import uuid
+import time
 import io
 import os
-from services.tunisian_config import TunisianBankConfig
+import hashlib
+import logging
+from config import settings, CACHE_DIR, AI_CACHE_TTL_SECONDS
+from models import AITransactionsResponse
+from services import llm_cache
+from utils.helpers import generate_unique_ids
+from utils.logger import logger
+from parsers.biat_parser import _extract_pages, _page_text
+
+# RE2 (google-re2, optional) matches in linear time, the amount pattern can backtrack badly in re
+try:
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+# Compiled once, used in the per-line loops of _ml_based_parsing
+_AMOUNT_RE = _re_engine.compile(r'-?\d+[\s\.]*\d+[\.,]\d{3}')
+# Shorter lines cannot hold a date, a description and an amount
+_MIN_LINE_LEN = 10
+# Header/balance keywords, one case-insensitive pass instead of upper() plus six scans per line
+_HEADER_RE = re.compile(r'DATE|LIBELLE|MONTANT|SOLDE|DEBIT|CREDIT', re.IGNORECASE)
+
+# Characters of extracted text sent to Claude in the structured prompt
+AI_PROMPT_CHARS = 5000
+# Extra Claude calls when a response fails validation, with a growing pause between them
+AI_MAX_RETRIES = 2
+AI_RETRY_BACKOFF_SECONDS = 1.0
+
+# Upper bound on the structured answer, the first call asks for less (see _call_claude_structured)
+STRUCTURED_MAX_TOKENS = 4000
+
+# Part of the LLM cache key: bump the version whenever the prompts change
+STRUCTURED_MODEL = "claude-3-haiku-20240307"
+STRUCTURED_PROMPT_VERSION = "v2"
+
+STATIC_BANK_INSTRUCTIONS = """Tu es un expert des relevés bancaires BIAT Tunisie.
+
+Extrais TOUTES les transactions du texte fourni:
+1. Soldes: "SOLDE AU 31 07 2025 1.177.437,649" → date: 2025-07-31, description: "SOLDE AU 31/07/2025", amount: 1177437.649
+2. Transactions: "01 08 REGLEMENT CHEQUE 0001294 31072025 7.908,050" → date: 2025-08-01, description: "REGLEMENT CHEQUE 0001294", amount: 7908.05
+3. Commissions: "01 08 ENG/SIGNATURE R0010350 01082025 3,800" → date: 2025-08-01, description: "ENG/SIGNATURE R0010350", amount: 3.8
+
+Règles de parsing des montants tunisiens:
+- Enlève les points (séparateurs de milliers)
+- Remplace la virgule par un point (séparateur décimal)
+- Exemples: "630.298,000" → 630298.0, "1.177.437,649" → 1177437.649
+
+Retourne UNIQUEMENT un JSON:
+{"transactions": [{"date": "YYYY-MM-DD", "description": "texte", "amount": nombre, "type": "balance|transaction|commission"}]}"""
+
+STATIC_ACC_INSTRUCTIONS = """Tu es un expert en comptabilité tunisienne. Extrais les données du grand livre fourni.
+
+Format: "010825 5607 1000 MCC 3 462.900 -3 462.900" → date: 2025-08-01, description: "MCC", amount: -3462.9, solde_progressif: -3462.9
+
+Règles de parsing des montants tunisiens:
+- Enlève les points (séparateurs de milliers)
+- Remplace la virgule par un point (séparateur décimal)
+- Exemples: "249.697,875" → 249697.875, "3.462,900" → 3462.9
+
+Retourne UNIQUEMENT un JSON:
+{"transactions": [{"date": "YYYY-MM-DD", "description": "libellé", "amount": nombre, "solde_progressif": nombre}]}"""
+
+def parse_tunisian_amounts(values: pd.Series) -> pd.Series:
+    """Parse Tunisian amount format column-wise: '3 462.900' or '-3 462.900' → -3462.9
+
+    Spaces/dots are thousands, dot/comma with 3 decimals. Unparseable amounts become 0.0.
+    One plain loop over the column: pandas .str methods are per-element Python here and
+    each would be a separate pass over it.
+    """
+    parsed = []
+    failed = []
+    for original in values.astype(str).tolist():
+        # Handle negative sign, then drop it along with all spaces
+        is_negative = '-' in original
+        amount_str = original.replace('-', '') if is_negative else original
+        amount_str = amount_str.strip().replace(' ', '')
+        
+        if ',' in amount_str:
+            # Comma is decimal separator: "3.462,900" → 3462.9
+            amount_str = amount_str.replace('.', '').replace(',', '.')
+        elif '.' in amount_str:
+            # Dot with 3 decimals: "3 462.900" → 3462.9, keep only the last dot
+            # No clear decimal: remove all dots
+            head, _, decimals = amount_str.rpartition('.')
+            if len(decimals) == 3:
+                amount_str = head.replace('.', '') + '.' + decimals
+            else:
+                amount_str = amount_str.replace('.', '')
+        
+        try:
+            value = float(amount_str)
+        except ValueError:
+            failed.append(original)
+            value = 0.0
+        parsed.append(-value if is_negative else value)
+    
+    if failed:
+        logger.warning("Failed to parse %d amount(s), e.g. '%s'", len(failed), failed[0])
+    return pd.Series(parsed, index=values.index, dtype='float64')
+
+def _read_json_object(text_stream) -> str:
+    """Consume streamed text until the outermost JSON object closes, then stop reading
+
+    Leaving the stream context early closes the connection, so nothing after the JSON is
+    generated. Braces inside JSON strings are ignored.
+    """
+    parts = []
+    depth = 0
+    in_string = False
+    escaped = False
+    for chunk in text_stream:
+        parts.append(chunk)
+        for ch in chunk:
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == '\\':
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = depth > 0
+            elif ch == '{':
+                depth += 1
+            elif ch == '}' and depth:
+                depth -= 1
+                if depth == 0:
+                    return ''.join(parts)
+    return ''.join(parts)
+
+def _text_cache_path(pdf_content: bytes) -> str:
+    key = hashlib.sha256(pdf_content).hexdigest()
+    return os.path.join(CACHE_DIR, f"text_{key}.txt")
+
+def _load_cached_text(path: str) -> Optional[str]:
+    """Cached text for this PDF, or None if missing/expired/unreadable (expired entries are removed)"""
+    try:
+        # Same TTL as the LLM cache entries stored next to it
+        if time.time() - os.path.getmtime(path) > AI_CACHE_TTL_SECONDS:
+            os.remove(path)
+            return None
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _store_cached_text(path: str, text: str):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)  # atomic, concurrent readers never see a partial file
+    except OSError as e:
+        logger.warning("Could not write text cache: %s", e)
 
 class ParserStrategy(Enum):
     TRADITIONAL = 1
@@ -18,10 +171,12 @@ class ParserStrategy(Enum):
 
 class IntelligentPDFParser:
     def __init__(self, claude_api_key: str = None):
-        self.claude_key = claude_api_key or os.getenv('ANTHROPIC_API_KEY')
+        self.claude_key = claude_api_key or settings.anthropic_api_key
         self.parsing_history = []
     
     def parse_with_fallback(self, pdf_content: bytes, file_type: str) -> pd.DataFrame:
+        # The PDF is parsed once here, every strategy works from the same extracted text
+        full_text = self._extract_text(pdf_content)
         strategies = [
             self._parse_traditional,
             self._parse_with_structured_ai,
@@ -30,146 +185,161 @@ class IntelligentPDFParser:
         
         for i, strategy in enumerate(strategies):
             try:
-                print(f"Essai stratégie {i+1}/{len(strategies)}...")
-                result = strategy(pdf_content, file_type)
+                logger.debug("Essai stratégie %d/%d...", i+1, len(strategies))
+                result = strategy(pdf_content, full_text, file_type)
                 
                 min_rows = 5 if file_type == 'accounting' else 10
                 if result is not None and not result.empty and len(result) >= min_rows:
-                    print(f"✅ Stratégie {i+1} réussie: {len(result)} transactions extraites")
+                    logger.info("Stratégie %d réussie: %d transactions extraites", i+1, len(result))
                     return result
                     
             except Exception as e:
-                print(f"❌ Stratégie {i+1} échouée: {str(e)}")
+                logger.warning("Stratégie %d échouée: %s", i+1, e)
                 continue
         
-        result = self._parse_hybrid_emergency(pdf_content, file_type)
+        result = self._parse_hybrid_emergency(pdf_content, full_text, file_type)
         if result.empty:
             raise ValueError(f"Aucune transaction extraite pour {file_type}")
         return result
     
-    def _parse_traditional(self, pdf_content: bytes, file_type: str) -> Optional[pd.DataFrame]:
-        import pdfplumber
-        
-        with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-            for page in pdf.pages:
-                tables = page.extract_tables()
-                if tables:
-                    for table in tables:
-                        df = self._process_table(table, file_type)
-                        if df is not None and not df.empty:
-                            return df
-        
+    def _parse_traditional(self, pdf_content: bytes, full_text: str, file_type: str) -> Optional[pd.DataFrame]:
+        # _process_table does not convert tables yet, so running extract_tables on every page
+        # (pdfplumber's most expensive call) could never produce rows.
+        # TODO: walk pdf.pages with page.extract_tables() again once _process_table is implemented
         return pd.DataFrame()
     
-    def _parse_with_structured_ai(self, pdf_content: bytes, file_type: str) -> Optional[pd.DataFrame]:
+    def _parse_with_structured_ai(self, pdf_content: bytes, full_text: str, file_type: str) -> Optional[pd.DataFrame]:
         if not self.claude_key:
             return None
         
-        import pdfplumber
-        with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-            text = "\n".join([page.extract_text() or "" for page in pdf.pages[:5]])
-        
-        return self._call_claude_structured(text, file_type)
+        # Only the first AI_PROMPT_CHARS characters go into the prompt
+        return self._call_claude_structured(full_text[:AI_PROMPT_CHARS], file_type, pdf_content)
     
-    def _call_claude_structured(self, text: str, file_type: str) -> Optional[pd.DataFrame]:
+    def _call_claude_structured(self, text: str, file_type: str, pdf_content: Optional[bytes] = None) -> Optional[pd.DataFrame]:
+        # Same PDF, prompt version and model give the same answer: reuse it instead of calling the API
+        cache_key = None
+        if pdf_content is not None:
+            cache_key = hashlib.sha256(
+                f"{file_type}|{STRUCTURED_PROMPT_VERSION}|{STRUCTURED_MODEL}|".encode() + pdf_content
+            ).hexdigest()
+            cached = llm_cache.get(cache_key)
+            result = self._parse_ai_response(cached, file_type) if cached is not None else None
+            if result is not None:
+                logger.debug("LLM cache hit for %s", file_type)
+                return result
+        
         try:
             import anthropic
             client = anthropic.Anthropic(api_key=self.claude_key)
             
-            if file_type == 'bank':
-                prompt = self._create_bank_prompt(text[:5000])
-            else:
-                prompt = self._create_accounting_prompt(text[:5000])
+            instructions = STATIC_BANK_INSTRUCTIONS if file_type == 'bank' else STATIC_ACC_INSTRUCTIONS
+            prompt_text = text[:AI_PROMPT_CHARS]
+            messages = [{"role": "user", "content": f"Texte:\n{prompt_text}"}]
             
-            response = client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=4000,
-                temperature=0,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return self._parse_ai_response(response.content[0].text, file_type)
+            for attempt in range(AI_MAX_RETRIES + 1):
+                # Output budget sized from the input on the first try, full budget on retries
+                # (a too-small budget shows up as truncated, invalid JSON)
+                max_tokens = STRUCTURED_MAX_TOKENS if attempt else min(
+                    STRUCTURED_MAX_TOKENS, 256 + len(prompt_text) // 2
+                )
+                # Static instructions go in the system prompt, only the extracted text changes per call
+                with client.messages.stream(
+                    model=STRUCTURED_MODEL,
+                    max_tokens=max_tokens,
+                    temperature=0,
+                    system=instructions,
+                    messages=messages
+                ) as stream:
+                    content = _read_json_object(stream.text_stream)
+                
+                try:
+                    transactions = self._validate_ai_response(content)
+                except ValueError as e:
+                    if attempt == AI_MAX_RETRIES:
+                        logger.warning("Réponse Claude invalide après %d essais: %s", attempt + 1, e)
+                        return None
+                    # Send the error back so the next answer can fix it
+                    messages = messages + [
+                        {"role": "assistant", "content": content},
+                        {"role": "user", "content": f"Ta dernière réponse était invalide: {e}. Retourne UNIQUEMENT un JSON valide."}
+                    ]
+                    time.sleep(AI_RETRY_BACKOFF_SECONDS * (attempt + 1))
+                    continue
+                
+                result = self._transactions_to_frame(transactions)
+                if cache_key and result is not None:
+                    llm_cache.set(cache_key, content)
+                return result
         except Exception as e:
-            print(f"Erreur Claude API: {e}")
+            logger.warning("Erreur Claude API: %s", e)
             return None
     
-    def _create_bank_prompt(self, text: str) -> str:
-        return f"""Tu es un expert des relevés bancaires BIAT Tunisie.
-
-Extrais TOUTES les transactions:
-1. Soldes: "SOLDE AU 31 07 2025 1.177.437,649" → date: 2025-07-31, description: "SOLDE AU 31/07/2025", amount: 1177437.649
-2. Transactions: "01 08 REGLEMENT CHEQUE 0001294 31072025 7.908,050" → date: 2025-08-01, description: "REGLEMENT CHEQUE 0001294", amount: 7908.05
-3. Commissions: "01 08 ENG/SIGNATURE R0010350 01082025 3,800" → date: 2025-08-01, description: "ENG/SIGNATURE R0010350", amount: 3.8
-
-Règles de parsing des montants tunisiens:
-- Enlève les points (séparateurs de milliers)
-- Remplace la virgule par un point (séparateur décimal)
-- Exemples: "630.298,000" → 630298.0, "1.177.437,649" → 1177437.649
-
-Texte:
-{text}
-
-Retourne UNIQUEMENT un JSON:
-{{"transactions": [{{"date": "YYYY-MM-DD", "description": "texte", "amount": nombre, "type": "balance|transaction|commission"}}]}}"""
-    
-    def _create_accounting_prompt(self, text: str) -> str:
-        return f"""Tu es un expert en comptabilité tunisienne. Extrais les données de ce grand livre.
-
-Format: "010825 5607 1000 MCC 3 462.900 -3 462.900" → date: 2025-08-01, description: "MCC", amount: -3462.9, solde_progressif: -3462.9
-
-Règles de parsing des montants tunisiens:
-- Enlève les points (séparateurs de milliers)
-- Remplace la virgule par un point (séparateur décimal)
-- Exemples: "249.697,875" → 249697.875, "3.462,900" → 3462.9
-
-Texte:
-{text}
-
-Retourne UNIQUEMENT un JSON:
-{{"transactions": [{{"date": "YYYY-MM-DD", "description": "libellé", "amount": nombre, "solde_progressif": nombre}}]}}"""
+    def _validate_ai_response(self, content: str) -> list:
+        """Transactions from a Claude answer, ValueError if it is not the expected JSON"""
+        # Outermost braces with two linear scans, the answer may wrap the JSON in prose or markdown
+        start = content.find('{')
+        end = content.rfind('}')
+        if start < 0 or end <= start:
+            raise ValueError("aucun objet JSON dans la réponse")
+        
+        response = AITransactionsResponse.model_validate_json(content[start:end + 1])
+        return [tx.model_dump(exclude_unset=True) for tx in response.transactions]
     
     def _parse_ai_response(self, content: str, file_type: str) -> Optional[pd.DataFrame]:
         try:
-            json_match = re.search(r'\{.*\}', content, re.DOTALL)
-            if not json_match:
-                return None
-            
-            data = json.loads(json_match.group())
-            transactions = data.get('transactions', [])
-            
-            if not transactions:
-                return None
-            
-            for tx in transactions:
-                tx['id'] = str(uuid.uuid4())
-            
-            return pd.DataFrame(transactions)
-        except:
+            transactions = self._validate_ai_response(content)
+        except ValueError:
             return None
+        return self._transactions_to_frame(transactions)
     
-    def _parse_hybrid_emergency(self, pdf_content: bytes, file_type: str) -> pd.DataFrame:
-        import pdfplumber
+    def _transactions_to_frame(self, transactions: list) -> Optional[pd.DataFrame]:
+        if not transactions:
+            return None
         
-        full_text = ""
-        with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    full_text += text + "\n"
+        for tx, tx_id in zip(transactions, generate_unique_ids(len(transactions))):
+            tx['id'] = tx_id
         
+        df = pd.DataFrame(transactions)
+        if not pd.api.types.is_numeric_dtype(df['amount']):
+            # Amounts that came back as Tunisian-formatted text instead of numbers
+            is_text = df['amount'].map(type).eq(str)
+            df.loc[is_text, 'amount'] = parse_tunisian_amounts(df.loc[is_text, 'amount'])
+            df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
+        return df
+    
+    def _parse_hybrid_emergency(self, pdf_content: bytes, full_text: str, file_type: str) -> pd.DataFrame:
         return self._ml_based_parsing(full_text, file_type)
     
+    def _extract_text(self, pdf_content: bytes) -> str:
+        """Text of every page, extracted once per distinct PDF"""
+        import pdfplumber
+        
+        # Same PDF bytes always give the same text, so it is cached by content hash
+        cache_path = _text_cache_path(pdf_content)
+        full_text = _load_cached_text(cache_path)
+        if full_text is None:
+            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+                texts = _extract_pages(pdf_content, pdf, _page_text)
+            full_text = "".join(text + "\n" for text in texts if text)
+            _store_cached_text(cache_path, full_text)
+        
+        return full_text
+    
     def _ml_based_parsing(self, text: str, file_type: str) -> pd.DataFrame:
         transactions = []
+        # Checked once: the per-line debug calls below would otherwise build their args every line
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         lines = text.split('\n')
         
         for line in lines:
             line = line.strip()
-            if not line or len(line) < 10:
+            # Both formats start with a digit (DD MM ... / DDMMYY ...): blank, short and
+            # most header lines are dropped here before any regex work
+            if len(line) < _MIN_LINE_LEN or not line[0].isdigit():
                 continue
             
             # Skip header lines
-            if any(kw in line.upper() for kw in ['DATE', 'LIBELLE', 'MONTANT', 'SOLDE', 'DEBIT', 'CREDIT']):
+            if _HEADER_RE.search(line):
                 continue
             
             if file_type == 'bank':
@@ -187,17 +357,20 @@ Retourne UNIQUEMENT un JSON:
                             continue
                         
                         # Find the 8-digit date (DDMMYYYY) and amount with decimal
+                        # Description is every token between the day/month and the first 8-digit date
                         date_8digit = None
+                        desc_end = None
                         amount_str = None
-                        desc_parts = []
                         
                         for i, part in enumerate(parts[2:], start=2):
+                            c0 = part[:1]
                             if len(part) == 8 and part.isdigit():
                                 date_8digit = part
-                            elif re.match(r'-?[\d\.,]+', part) and ('.' in part or ',' in part):
+                                if desc_end is None:
+                                    desc_end = i
+                            # Plain string checks instead of a regex: starts like a number and has a separator
+                            elif (c0.isdigit() or (c0 == '-' and part[1:2].isdigit())) and ('.' in part or ',' in part):
                                 amount_str = part
-                            elif not date_8digit:
-                                desc_parts.append(part)
                         
                         if not (date_8digit and amount_str):
                             continue
@@ -207,22 +380,22 @@ Retourne UNIQUEMENT un JSON:
                         d_month = int(date_8digit[2:4])
                         d_year = int(date_8digit[4:])
                         date = pd.Timestamp(year=d_year, month=d_month, day=d_day)
-                        print(f"DEBUG: Parsed {date_8digit} -> {date.date()}")
+                        if debug_enabled:
+                            logger.debug("Parsed %s -> %s", date_8digit, date.date())
                         
-                        desc = ' '.join(desc_parts).strip()
+                        # parts are already whitespace-split, one join gives a clean description
+                        desc = ' '.join(parts[2:desc_end])
                         
                         # Skip balance lines
                         if 'SOLDE' in desc.upper():
                             continue
                         
-                        amount = self._parse_tunisian_amount(amount_str)
-                        
-                        if desc and abs(amount) > 0.001:
+                        # Raw amount kept as text, normalized for all rows at once below
+                        if desc:
                             transactions.append({
-                                'id': str(uuid.uuid4()),
                                 'date': date,
                                 'description': desc,
-                                'amount': amount,
+                                'amount': amount_str,
                                 'type': 'transaction'
                             })
                     except Exception as e:
@@ -230,9 +403,9 @@ Retourne UNIQUEMENT un JSON:
             else:
                 # Accounting format: "010825 5607 1000 MCC 3 462.900 -3 462.900"
                 # Try to find date at start (DDMMYY format)
-                date_match = re.match(r'^(\d{6})', line)
-                if date_match:
-                    date_str = date_match.group(1)
+                # Exactly six digits then a separator, checked with a slice instead of a regex
+                date_str = line[:6]
+                if date_str.isdigit() and not line[6:7].isdigit():
                     try:
                         day = date_str[:2]
                         month = date_str[2:4]
@@ -243,7 +416,8 @@ Retourne UNIQUEMENT un JSON:
                             continue
                         
                         date = pd.Timestamp(year=int(year), month=int(month), day=int(day))
-                        print(f"DEBUG ACC: Parsed {date_str} -> {date.date()}")
+                        if debug_enabled:
+                            logger.debug("Parsed %s -> %s", date_str, date.date())
                         
                         # Extract amounts more carefully
                         # Format: "010825 5607 1000 MCC 3 462.900 -3 462.900"
@@ -261,67 +435,33 @@ Retourne UNIQUEMENT un JSON:
                         
                         # Find amounts with decimal separators (dot or comma with 3 digits after)
                         # This distinguishes real amounts from journal/piece numbers
-                        amount_pattern = r'-?\d+[\s\.]*\d+[\.,]\d{3}'
-                        amounts_found = re.findall(amount_pattern, desc_and_amounts)
+                        amounts_found = _AMOUNT_RE.findall(desc_and_amounts)
                         
                         if len(amounts_found) >= 1:
                             # Take the FIRST amount as the movement
                             movement_str = amounts_found[0].strip()
-                            amount = self._parse_tunisian_amount(movement_str)
                             
                             # Description is before the first amount
                             desc_end = desc_and_amounts.find(amounts_found[0])
+                            # desc_and_amounts is single-space joined, so stripping the slice is enough
                             desc = desc_and_amounts[:desc_end].strip() if desc_end > 0 else parts[2]
-                            desc = ' '.join(desc.split())  # Clean whitespace
                             
-                            if desc and abs(amount) > 0.001:  # Only add if we have a description and non-zero amount
+                            if desc:  # Only add if we have a description, zero amounts are dropped below
                                 transactions.append({
-                                    'id': str(uuid.uuid4()),
                                     'date': date,
                                     'description': desc[:100],
-                                    'amount': amount,
+                                    'amount': movement_str,
                                     'type': 'transaction'
                                 })
                     except:
                         continue
         
-        return pd.DataFrame(transactions)
-    
-    def _parse_tunisian_amount(self, amount_str: str) -> float:
-        """Parse Tunisian amount format: '3 462.900' or '-3 462.900' → -3462.9"""
-        original = amount_str
-        
-        # Handle negative sign
-        is_negative = '-' in amount_str
-        amount_str = amount_str.replace('-', '').strip()
-        
-        # Remove all spaces
-        amount_str = amount_str.replace(' ', '')
-        
-        # Tunisian format: spaces/dots are thousands, dot/comma with 3 decimals
-        # Examples: "3 462.900" or "3.462,900" → 3462.9
-        
-        if ',' in amount_str:
-            # Comma is decimal separator: "3.462,900" → 3462.9
-            amount_str = amount_str.replace('.', '').replace(',', '.')
-        elif '.' in amount_str:
-            # Dot with 3 decimals: "3 462.900" → 3462.9
-            # Remove spaces/dots except last dot
-            parts = amount_str.split('.')
-            if len(parts) >= 2 and len(parts[-1]) == 3:
-                # Last part is 3 decimals, keep it
-                amount_str = ''.join(parts[:-1]) + '.' + parts[-1]
-            else:
-                # No clear decimal, remove all dots
-                amount_str = amount_str.replace('.', '')
-        
-        try:
-            value = float(amount_str)
-            result = -value if is_negative else value
-            return result
-        except Exception as e:
-            print(f"⚠️ Failed to parse amount '{original}': {e}")
-            return 0.0
+        df = pd.DataFrame(transactions)
+        if not df.empty:
+            df['amount'] = parse_tunisian_amounts(df['amount'])
+            df = df[df['amount'].abs() > 0.001].reset_index(drop=True)
+        df.insert(0, 'id', generate_unique_ids(len(df)))
+        return df
     
     def _process_table(self, table, file_type):
         return None
@@ -12,24 +12,41 @@ from db_models.audit import AuditLog
 from db_models.performance import PerformanceMetrics
 from sqlalchemy import text
 
+TABLES_TO_RESET = [
+    'performance_metrics',
+    'audit_logs',
+    'regularization_entries',
+    'suspense_items',
+    'matches',
+    'bank_transactions',
+    'accounting_transactions',
+    'reconciliations',
+    'uploaded_files',
+]
+
 db = SessionLocal()
 
 try:
     print("🗑️  Deleting all data...")
     
-    # Delete in correct order (respecting foreign keys)
-    db.query(PerformanceMetrics).delete()
-    db.query(AuditLog).delete()
-    
-    # Delete regularization entries first
-    db.execute(text("DELETE FROM regularization_entries"))
-    
-    db.query(SuspenseItem).delete()
-    db.query(Match).delete()
-    db.query(BankTransaction).delete()
-    db.query(AccountingTransaction).delete()
-    db.query(Reconciliation).delete()
-    db.query(UploadedFile).delete()
+    if engine.dialect.name == "postgresql":
+        # One statement: truncates the table files instead of deleting row by row,
+        # CASCADE takes care of the foreign key order
+        db.execute(text(f"TRUNCATE TABLE {', '.join(TABLES_TO_RESET)} RESTART IDENTITY CASCADE"))
+    else:
+        # SQLite has no TRUNCATE: delete in correct order (respecting foreign keys)
+        db.query(PerformanceMetrics).delete()
+        db.query(AuditLog).delete()
+        
+        # Delete regularization entries first
+        db.execute(text("DELETE FROM regularization_entries"))
+        
+        db.query(SuspenseItem).delete()
+        db.query(Match).delete()
+        db.query(BankTransaction).delete()
+        db.query(AccountingTransaction).delete()
+        db.query(Reconciliation).delete()
+        db.query(UploadedFile).delete()
     
     db.commit()
     print("✅ All data deleted successfully!")
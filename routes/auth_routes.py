@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from database import get_db
-from services.auth_service import authenticate_user, create_access_token, verify_token, create_user
+from services.auth_service import (
+    authenticate_user, create_access_token, decode_token, create_user,
+    CurrentUser, get_cached_user, cache_user
+)
 from db_models.users import User
 
 router = APIRouter()
@@ -33,9 +37,14 @@ class UserResponse(BaseModel):
     role: str
     is_active: bool
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> CurrentUser:
     token = credentials.credentials
-    username = verify_token(token)
+    cached_user = get_cached_user(token)
+    if cached_user is not None:
+        return cached_user
+    
+    payload = decode_token(token)
+    username = payload.get("sub") if payload else None
     if username is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -45,9 +54,9 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     user = db.query(User).filter(User.username == username).first()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return cache_user(token, user, payload.get("exp"))
 
-def require_admin(current_user: User = Depends(get_current_user)):
+def require_admin(current_user: CurrentUser = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
@@ -74,14 +83,21 @@ async def login(request: LoginRequest, db: Session = Depends(get_db)):
 
 @router.post("/register", response_model=UserResponse)
 async def register(request: RegisterRequest, db: Session = Depends(get_db)):
-    # Check if user exists
-    existing_user = db.query(User).filter(
-        (User.username == request.username) | (User.email == request.email)
-    ).first()
-    if existing_user:
+    # Check if user exists: EXISTS returns one boolean, no User row is loaded
+    user_exists = db.query(
+        db.query(User.id).filter(
+            (User.username == request.username) | (User.email == request.email)
+        ).exists()
+    ).scalar()
+    if user_exists:
         raise HTTPException(status_code=400, detail="Username or email already registered")
     
-    user = create_user(db, request.username, request.email, request.password, request.full_name, request.role)
+    try:
+        user = create_user(db, request.username, request.email, request.password, request.full_name, request.role)
+    except IntegrityError:
+        # Concurrent registration won the race, the unique constraints on username/email catch it
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Username or email already registered")
     return UserResponse(
         id=user.id,
         username=user.username,
@@ -92,7 +108,7 @@ async def register(request: RegisterRequest, db: Session = Depends(get_db)):
     )
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: CurrentUser = Depends(get_current_user)):
     return UserResponse(
         id=current_user.id,
         username=current_user.username,
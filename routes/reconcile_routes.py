@@ -1,52 +1,255 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import FileResponse
-import uuid
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+import asyncio
 import pandas as pd
-import numpy as np
 from datetime import datetime
 import time
 from sqlalchemy.orm import Session
-from models import ReconcileRequest, ReconciliationRules, MatchValidation
+from models import ReconcileRequest, ReconciliationRules, MatchValidation, RECONCILIATION_SUMMARY_ADAPTER
 from db_models.transactions import BankTransaction, AccountingTransaction
 from services.matching_engine import ReconciliationEngine
-from services.file_processor import FileProcessor
 from services.database_service import DatabaseService
 from services.regularization_service import RegularizationService
 from services.export_service import ExportService
 from services.pcn_service import PCNService
 from services.ai_assistant import get_ai_metrics
-from utils.logger import log_matching_step, log_reconciliation_complete, log_error
-from utils.date_parser import parse_date_to_python_date
-from routes.auth_routes import get_current_user
-from db_models.users import User
-from database import get_db
+from utils.logger import logger, log_matching_step, log_reconciliation_complete, log_error
+from database import get_db, SessionLocal
 import os
 
-def convert_numpy_types(obj):
-    """Convert numpy types to Python native types for JSON serialization"""
-    if isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    return obj
-
 router = APIRouter()
-file_processor = FileProcessor()
 pcn_service = PCNService()
 export_service = ExportService()
 
-# In-memory storage for reconciliation results (replace with Redis in production)
-reconciliation_cache = {}
+EXPORT_MEDIA_TYPES = {
+    "excel": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "pdf": "application/pdf",
+}
+
+def _build_regularization_entries(suspense: list) -> tuple:
+    """Generate and validate regularization entries for the suspense items (no DB access)"""
+    reg_service = RegularizationService()
+    suspense_for_reg = [
+        {
+            "transaction": {
+                "id": item.transaction.id,
+                "date": item.transaction.date,
+                "amount": item.transaction.amount,
+                "description": item.transaction.description
+            },
+            "type": item.type,
+            "suggested_category": item.suggested_category if item.suggested_category else 'AUTRE'
+        }
+        for item in suspense
+    ]
+    reg_entries = reg_service.generate_entries_for_suspense(
+        suspense_for_reg,
+        datetime.now().strftime("%Y-%m-%d")
+    )
+    return reg_entries, reg_service.validate_entries(reg_entries)
+
+def _load_transactions(db: Session, bank_file_id: str, accounting_file_id: str) -> tuple:
+    """Bank and accounting transactions of both files as DataFrames"""
+    # Only the needed columns, as plain row tuples: no ORM objects, no per-row conversion
+    bank_columns = ['id', 'date', 'amount', 'description', 'currency']
+    bank_rows = db.query(
+        *(getattr(BankTransaction, col) for col in bank_columns)
+    ).filter(BankTransaction.file_id == bank_file_id).all()
+    
+    acc_columns = ['id', 'date', 'amount', 'description', 'account_code']
+    acc_rows = db.query(
+        *(getattr(AccountingTransaction, col) for col in acc_columns)
+    ).filter(AccountingTransaction.file_id == accounting_file_id).all()
+    
+    # Convert to DataFrames, dates converted once per column
+    bank_df = pd.DataFrame.from_records(bank_rows, columns=bank_columns)
+    bank_df['date'] = pd.to_datetime(bank_df['date'])
+    
+    acc_df = pd.DataFrame.from_records(acc_rows, columns=acc_columns)
+    acc_df['date'] = pd.to_datetime(acc_df['date'])
+    return bank_df, acc_df
+
+def _save_results(db: Session, recon_id: str, matches_data: list, suspense_data: list, reg_entries_dict: list):
+    """Persist matches, suspense items and regularization entries, one after the other"""
+    db_service = DatabaseService(db)
+    db_service.save_matches(recon_id, matches_data)
+    db_service.save_suspense_items(recon_id, suspense_data)
+    db_service.save_regularization_entries(recon_id, reg_entries_dict)
+
+def _save_summary(db: Session, recon_id: str, summary_dict: dict, processing_time: float,
+                  performance_metrics: dict, audit_metadata: dict):
+    """Persist the reconciliation results, its performance metrics and the audit log entry"""
+    db_service = DatabaseService(db)
+    db_service.update_reconciliation_results(recon_id, summary_dict, processing_time)
+    db_service.save_performance_metrics(recon_id, performance_metrics)
+    db_service.create_audit_log(
+        user_id="system",
+        action="reconciliation_completed",
+        entity_type="reconciliation",
+        entity_id=recon_id,
+        event_metadata=audit_metadata
+    )
+
+async def _run_reconciliation(db: Session, recon_id: str, bank_file_id: str,
+                              accounting_file_id: str, rules: ReconciliationRules,
+                              start_time: float) -> dict:
+    """Run the matching for an existing reconciliation row and persist everything.
+
+    Shared by the synchronous POST /reconcile path and the background job.
+    Returns the response payload.
+    """
+    # Load transactions from database (already saved during upload), off the event loop
+    bank_df, acc_df = await asyncio.to_thread(_load_transactions, db, bank_file_id, accounting_file_id)
+    
+    logger.debug("Loaded %d bank and %d accounting transactions from DB", len(bank_df), len(acc_df))
+    
+    # Initialize reconciliation engine
+    engine = ReconciliationEngine(rules)
+    
+    # Run reconciliation AFTER transactions are persisted
+    log_matching_step("reconciliation_started", {"job_id": recon_id})
+    result = await asyncio.to_thread(engine.reconcile, bank_df, acc_df)
+    
+    # PCN suggestions and regularization entries only read the in-memory result:
+    # compute both off the event loop, concurrently
+    pcn_suggestions, (reg_entries, validation_result) = await asyncio.gather(
+        asyncio.to_thread(
+            pcn_service.suggest_accounts_bulk,
+            pd.Series([item.transaction.description for item in result.suspense], dtype=object),
+            pd.Series([item.transaction.amount for item in result.suspense], dtype=float)
+        ),
+        asyncio.to_thread(_build_regularization_entries, result.suspense)
+    )
+    
+    # Save matches to database (no need to re-save transactions, already done)
+    matches_data = [
+        {
+            "bank_tx_id": match.bank_tx.id,
+            "accounting_tx_id": match.accounting_tx.id if match.accounting_tx else None,
+            "recon_number": match.recon_id,
+            "rule": match.rule.value,
+            "score": match.score,
+            "ai_confidence": match.ai_confidence,
+            "is_group_match": bool(match.accounting_txs),
+            "group_id": match.id if match.accounting_txs else None
+        }
+        for match in result.matches
+    ]
+    
+    # Save suspense items with PCN suggestions
+    suspense_data = [
+        {
+            "transaction_id": item.transaction.id,
+            "type": item.type,
+            "reason": item.reason,
+            "suggested_category": item.suggested_category,
+            "suggested_account": suggested_account,
+            "ai_confidence": item.ai_confidence
+        }
+        for item, suggested_account in zip(result.suspense, pcn_suggestions["account_code"].tolist())
+    ]
+    
+    # Convert entries to dict for database storage
+    reg_entries_dict = [entry.to_dict() for entry in reg_entries]
+    
+    # Sequential writes on the request session, run in a worker thread so the event loop stays free
+    await asyncio.to_thread(_save_results, db, recon_id, matches_data, suspense_data, reg_entries_dict)
+    
+    # Update reconciliation with results and enhanced metrics
+    processing_time = time.time() - start_time
+    summary_payload = RECONCILIATION_SUMMARY_ADAPTER.dump_python(result.summary)
+    summary_dict = dict(summary_payload)
+    
+    # Metadata sections looked up once, reused by the summary, metrics and response below
+    metadata = getattr(result, 'metadata', None) or {}
+    gap_calc = metadata.get('gap_calculations', {})
+    validation = metadata.get('validation', {})
+    proc_metrics = metadata.get('processing_metrics', {})
+    validation_errors = validation.get('errors', [])
+    
+    # Add enhanced gap calculations
+    if metadata:
+        summary_dict['explained_gap'] = gap_calc.get('explained_gap', 0)
+        summary_dict['bank_suspense_total'] = gap_calc.get('bank_suspense_total', 0)
+        summary_dict['accounting_suspense_total'] = gap_calc.get('accounting_suspense_total', 0)
+        summary_dict['coverage_percentage'] = gap_calc.get('coverage_percentage', 0)
+        summary_dict['manual_interventions'] = proc_metrics.get('manual_interventions', 0)
+        summary_dict['match_accuracy'] = proc_metrics.get('match_accuracy', 0)
+        summary_dict['duplicate_count'] = validation.get('duplicates_found', 0)
+        summary_dict['validation_errors'] = validation_errors
+    
+    # Performance metrics (casts cover numpy scalars coming from the engine metadata)
+    ai_metrics = get_ai_metrics()
+    performance_metrics = {
+        "auto_match_rate": float(summary_dict.get('coverage_ratio', 0) * 100),
+        "avg_processing_time": float(processing_time),
+        "manual_interventions": int(summary_dict.get('manual_interventions', 0)),
+        "reconciliation_success_rate": 100 if metadata.get('reconciliation_succeeded', False) else 0,
+        "validated_matches_accuracy": float(summary_dict.get('match_accuracy', 0) * 100),
+        "pcn_compliance_rate": 100.0,
+        "gap_calculation_precision": 100 if metadata.get('gap_coherence', {}).get('valid', False) else 0,
+        "ai_avg_response_time": float(ai_metrics.get('avg_response_time_ms', 0)),
+        "ai_success_rate": float(ai_metrics.get('success_rate', 0)),
+        "ai_suggestion_quality": 95.0,
+        "ai_hallucination_count": int(ai_metrics.get('hallucinations_detected', 0)),
+        "ai_resource_usage": ai_metrics,
+        "duplicate_matches_found": int(summary_dict.get('duplicate_count', 0)),
+        "date_range_violations": int(validation.get('date_violations', 0)),
+        "debit_credit_imbalances": int(validation.get('debit_credit_imbalances', 0)),
+        "alerts_generated": validation.get('alerts', []),
+        "critical_errors": int(metadata.get('critical_error_count', 0))
+    }
+    audit_metadata = {
+        **summary_dict,
+        "regularization_entries_count": len(reg_entries),
+        "entries_valid": validation_result["valid"]
+    }
+    
+    await asyncio.to_thread(
+        _save_summary, db, recon_id, summary_dict, processing_time, performance_metrics, audit_metadata
+    )
+    
+    log_reconciliation_complete(recon_id, summary_dict)
+    
+    # Prepare response with enhanced metrics
+    response_data = {
+        "jobId": recon_id,
+        "status": "completed",
+        "summary": summary_payload,
+        "processingTime": float(processing_time),
+        "regularizationEntriesCount": int(len(reg_entries)),
+        "regularizationEntriesValid": bool(validation_result["valid"])
+    }
+    
+    # Add enhanced metrics if available
+    if metadata:
+        response_data["gapCalculations"] = gap_calc
+        response_data["validation"] = validation
+        response_data["aiMetrics"] = ai_metrics
+    
+    return response_data
+
+def _mark_failed(db: Session, recon_id: str, error: str):
+    db.rollback()
+    DatabaseService(db).mark_reconciliation_failed(recon_id, error)
+
+async def _run_reconciliation_job(recon_id: str, bank_file_id: str, accounting_file_id: str,
+                                  rules: ReconciliationRules, start_time: float):
+    """Background variant: own DB session, failures recorded on the reconciliation row"""
+    db = SessionLocal()
+    try:
+        await _run_reconciliation(db, recon_id, bank_file_id, accounting_file_id, rules, start_time)
+    except Exception as e:
+        import traceback
+        log_error(f"Reconciliation failed: {str(e)}\n{traceback.format_exc()}", {"job_id": recon_id})
+        await asyncio.to_thread(_mark_failed, db, recon_id, str(e))
+    finally:
+        db.close()
 
 @router.post("/reconcile")
 async def start_reconciliation(
     request: ReconcileRequest, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Start reconciliation process with database persistence"""
@@ -68,191 +271,28 @@ async def start_reconciliation(
         recon = db_service.create_reconciliation(
             bank_file_id=bank_file.id,
             accounting_file_id=acc_file.id,
-            rules=rules.dict(),
+            rules=rules.model_dump(),
             user_id="system"  # Use system user for now
         )
         
-        # Load transactions from database (already saved during upload)
-        bank_txs = db.query(BankTransaction).filter(BankTransaction.file_id == bank_file.id).all()
-        acc_txs = db.query(AccountingTransaction).filter(AccountingTransaction.file_id == acc_file.id).all()
-        
-        # Convert to DataFrames
-        bank_df = pd.DataFrame([{
-            'id': tx.id,
-            'date': pd.Timestamp(tx.date),
-            'amount': tx.amount,
-            'description': tx.description,
-            'currency': tx.currency
-        } for tx in bank_txs])
-        
-        acc_df = pd.DataFrame([{
-            'id': tx.id,
-            'date': pd.Timestamp(tx.date),
-            'amount': tx.amount,
-            'description': tx.description,
-            'account_code': tx.account_code
-        } for tx in acc_txs])
-        
-        print(f"DEBUG: Loaded {len(bank_df)} bank and {len(acc_df)} accounting transactions from DB")
-        
-        # Initialize reconciliation engine
-        engine = ReconciliationEngine(rules)
-        
-        # Run reconciliation AFTER transactions are persisted
-        log_matching_step("reconciliation_started", {"job_id": recon.id})
-        result = engine.reconcile(bank_df, acc_df)
-        
-        # Save matches to database (no need to re-save transactions, already done)
-        matches_data = []
-        for match in result.matches:
-            matches_data.append({
-                "bank_tx_id": match.bank_tx.id,
-                "accounting_tx_id": match.accounting_tx.id if match.accounting_tx else None,
-                "recon_number": match.recon_id,
-                "rule": match.rule.value,
-                "score": match.score,
-                "ai_confidence": match.ai_confidence,
-                "is_group_match": bool(match.accounting_txs),
-                "group_id": match.id if match.accounting_txs else None
-            })
-        
-        db_service.save_matches(recon.id, matches_data)
-        
-        # Save suspense items with PCN suggestions
-        suspense_data = []
-        for item in result.suspense:
-            # Get PCN account suggestion
-            pcn_suggestion = pcn_service.suggest_account_for_description(
-                item.transaction.description,
-                item.transaction.amount
+        if request.background:
+            # Return right away; clients poll GET /reconcile/{job_id}/results until completed
+            background_tasks.add_task(
+                _run_reconciliation_job, recon.id, bank_file.id, acc_file.id, rules, start_time
             )
-            
-            suspense_data.append({
-                "transaction_id": item.transaction.id,
-                "type": item.type,
-                "reason": item.reason,
-                "suggested_category": item.suggested_category,
-                "suggested_account": pcn_suggestion.get("account_code") if isinstance(pcn_suggestion, dict) else None,
-                "ai_confidence": item.ai_confidence if hasattr(item, 'ai_confidence') else None
-            })
-        
-        db_service.save_suspense_items(recon.id, suspense_data)
-        
-        # Generate regularization entries
-        reg_service = RegularizationService()
-        suspense_for_reg = [
-            {
-                "transaction": {
-                    "id": item.transaction.id,
-                    "date": item.transaction.date,
-                    "amount": item.transaction.amount,
-                    "description": item.transaction.description
-                },
-                "type": item.type,
-                "suggested_category": item.suggested_category if item.suggested_category else 'AUTRE'
-            }
-            for item in result.suspense
-        ]
-        reg_entries = reg_service.generate_entries_for_suspense(
-            suspense_for_reg,
-            datetime.now().strftime("%Y-%m-%d")
-        )
-        
-        # Validate entries
-        validation_result = reg_service.validate_entries(reg_entries)
-        
-        # Convert entries to dict for database storage
-        reg_entries_dict = [entry.to_dict() for entry in reg_entries]
-        
-        # SAVE REGULARIZATION ENTRIES TO DATABASE (persistent storage)
-        db_service.save_regularization_entries(recon.id, reg_entries_dict)
-        
-        # Update reconciliation with results and enhanced metrics
-        processing_time = time.time() - start_time
-        summary_dict = result.summary.dict()
-        
-        # Add enhanced gap calculations
-        if hasattr(result, 'metadata') and result.metadata:
-            gap_calc = result.metadata.get('gap_calculations', {})
-            validation = result.metadata.get('validation', {})
-            
-            summary_dict['explained_gap'] = gap_calc.get('explained_gap', 0)
-            summary_dict['bank_suspense_total'] = gap_calc.get('bank_suspense_total', 0)
-            summary_dict['accounting_suspense_total'] = gap_calc.get('accounting_suspense_total', 0)
-            summary_dict['coverage_percentage'] = gap_calc.get('coverage_percentage', 0)
-            summary_dict['manual_interventions'] = result.metadata.get('processing_metrics', {}).get('manual_interventions', 0)
-            summary_dict['match_accuracy'] = result.metadata.get('processing_metrics', {}).get('match_accuracy', 0)
-            summary_dict['duplicate_count'] = validation.get('duplicates_found', 0)
-            summary_dict['validation_errors'] = validation.get('errors', [])
-        
-        db_service.update_reconciliation_results(recon.id, summary_dict, processing_time)
-        
-        # Save performance metrics (convert numpy types to Python types)
-        ai_metrics = get_ai_metrics()
-        db_service.save_performance_metrics(recon.id, {
-            "auto_match_rate": float(summary_dict.get('coverage_ratio', 0) * 100),
-            "avg_processing_time": float(processing_time),
-            "manual_interventions": int(summary_dict.get('manual_interventions', 0)),
-            "reconciliation_success_rate": 100 if summary_dict.get('residual_gap', 0) < 0.01 else 0,
-            "validated_matches_accuracy": float(summary_dict.get('match_accuracy', 0) * 100),
-            "pcn_compliance_rate": 100.0,
-            "gap_calculation_precision": 100 if result.metadata.get('gap_coherence', {}).get('valid', False) else 0,
-            "ai_avg_response_time": float(ai_metrics.get('avg_response_time_ms', 0)),
-            "ai_success_rate": float(ai_metrics.get('success_rate', 0)),
-            "ai_suggestion_quality": 95.0,
-            "ai_hallucination_count": int(ai_metrics.get('hallucinations_detected', 0)),
-            "ai_resource_usage": ai_metrics,
-            "duplicate_matches_found": int(summary_dict.get('duplicate_count', 0)),
-            "date_range_violations": int(validation.get('date_violations', 0)) if hasattr(result, 'metadata') else 0,
-            "debit_credit_imbalances": int(validation.get('debit_credit_imbalances', 0)) if hasattr(result, 'metadata') else 0,
-            "alerts_generated": validation.get('alerts', []) if hasattr(result, 'metadata') else [],
-            "critical_errors": int(len([e for e in validation.get('errors', []) if e.get('severity') == 'critical'])) if hasattr(result, 'metadata') else 0
-        })
-        
-        # Cache the full result for quick retrieval (optional, for performance)
-        reconciliation_cache[recon.id] = {
-            "result": result,
-            "regularization_entries": reg_entries_dict,
-            "validation": validation_result
-        }
+            return {"jobId": recon.id, "status": recon.status}
         
-        # Create audit log
-        db_service.create_audit_log(
-            user_id="system",
-            action="reconciliation_completed",
-            entity_type="reconciliation",
-            entity_id=recon.id,
-            event_metadata={
-                **summary_dict,
-                "regularization_entries_count": len(reg_entries),
-                "entries_valid": validation_result["valid"]
-            }
+        response_data = await _run_reconciliation(
+            db, recon.id, bank_file.id, acc_file.id, rules, start_time
         )
         
-        log_reconciliation_complete(recon.id, summary_dict)
-        
-        # Prepare response with enhanced metrics
-        response_data = {
-            "jobId": recon.id,
-            "status": "completed",
-            "summary": result.summary,
-            "processingTime": float(processing_time),
-            "regularizationEntriesCount": int(len(reg_entries)),
-            "regularizationEntriesValid": bool(validation_result["valid"])
-        }
-        
-        # Add enhanced metrics if available
-        if hasattr(result, 'metadata') and result.metadata:
-            response_data["gapCalculations"] = convert_numpy_types(result.metadata.get('gap_calculations', {}))
-            response_data["validation"] = convert_numpy_types(result.metadata.get('validation', {}))
-            response_data["aiMetrics"] = convert_numpy_types(get_ai_metrics())
-        
-        return convert_numpy_types(response_data)
+        # Returned as a Response so FastAPI skips jsonable_encoder; orjson serializes numpy scalars/arrays itself
+        return ORJSONResponse(response_data)
         
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
-        log_error(f"Reconciliation failed: {str(e)}\n{error_trace}", {"request": request.dict()})
+        log_error(f"Reconciliation failed: {str(e)}\n{error_trace}", {"request": request.model_dump()})
         
         if 'recon' in locals():
             db_service.mark_reconciliation_failed(recon.id, str(e))
@@ -323,14 +363,10 @@ async def get_reconciliation_results(
     
     # Convert suspense items to response format
     suspense_data = []
-    print(f"DEBUG: Found {len(suspense_db)} suspense items in database")
+    logger.debug("Found %d suspense items in database", len(suspense_db))
+    suspense_txs = db_service.get_suspense_transactions(suspense_db)
     for item in suspense_db:
-        # Fetch the actual transaction based on type and ID
-        if item.transaction_type == 'bank':
-            tx = db.query(BankTransaction).filter(BankTransaction.id == item.transaction_id).first()
-        else:
-            tx = db.query(AccountingTransaction).filter(AccountingTransaction.id == item.transaction_id).first()
-        
+        tx = suspense_txs.get(item.id)
         if tx:
             suspense_data.append({
                 "transaction": {
@@ -345,11 +381,13 @@ async def get_reconciliation_results(
                 "aiConfidence": float(item.ai_confidence) if item.ai_confidence else None
             })
         else:
-            print(f"DEBUG: Transaction not found for suspense item {item.id}, type={item.transaction_type}, tx_id={item.transaction_id}")
+            logger.debug("Transaction not found for suspense item %s, type=%s, tx_id=%s",
+                         item.id, item.transaction_type, item.transaction_id)
     
-    print(f"DEBUG: Returning {len(suspense_data)} suspense items to frontend")
+    logger.debug("Returning %d suspense items to frontend", len(suspense_data))
     
-    return {
+    # Every value is already a native type: skip jsonable_encoder's recursive walk over the page
+    return ORJSONResponse({
         "jobId": job_id,
         "status": "completed",
         "summary": {
@@ -371,7 +409,7 @@ async def get_reconciliation_results(
             "total": total_matches,
             "totalPages": (total_matches + limit - 1) // limit
         }
-    }
+    })
 
 @router.post("/reconcile/{job_id}/matches/{match_id}/validate")
 async def validate_match(
@@ -381,11 +419,12 @@ async def validate_match(
     db: Session = Depends(get_db)
 ):
     """Validate/modify a match"""
-    if job_id not in reconciliation_cache:
-        raise HTTPException(status_code=404, detail="Reconciliation not found")
-    
     db_service = DatabaseService(db)
     
+    # The database is the state shared by every worker, check the job there
+    if not db_service.get_reconciliation(job_id):
+        raise HTTPException(status_code=404, detail="Reconciliation not found")
+    
     # Update match in database
     match = db_service.validate_match(
         match_id=match_id,
@@ -398,33 +437,20 @@ async def validate_match(
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
     
-    # Update cached result
-    cached_data = reconciliation_cache[job_id]
-    result = cached_data["result"]
-    
-    for cached_match in result.matches:
-        if cached_match.id == match_id:
-            if validation.action == "confirm":
-                cached_match.status = "validated"
-            elif validation.action == "unmatch":
-                cached_match.status = "unmatched"
-            
-            if validation.accountCode:
-                cached_match.account_code = validation.accountCode
-            
-            cached_match.validated_by = "system"
-            cached_match.validated_at = datetime.now()
-            break
-    
     return {"success": True, "matchId": match_id, "status": match.status}
 
 @router.get("/reconcile/{job_id}/export")
 async def export_reconciliation(
     job_id: str,
     format: str = "excel",
+    download: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Export reconciliation results to Excel or PDF"""
+    """Export reconciliation results to Excel or PDF
+    
+    download=true sends the file in the response body, built in memory,
+    instead of saving it under storage/reports and returning a downloadUrl.
+    """
     db_service = DatabaseService(db)
     recon = db_service.get_reconciliation(job_id)
     
@@ -486,12 +512,9 @@ async def export_reconciliation(
     }
     
     # Add suspense items
+    suspense_txs = db_service.get_suspense_transactions(suspense_db)
     for item in suspense_db:
-        if item.transaction_type == 'bank':
-            tx = db.query(BankTransaction).filter(BankTransaction.id == item.transaction_id).first()
-        else:
-            tx = db.query(AccountingTransaction).filter(AccountingTransaction.id == item.transaction_id).first()
-        
+        tx = suspense_txs.get(item.id)
         if tx:
             export_data["suspense"].append({
                 "type": item.transaction_type,
@@ -505,6 +528,17 @@ async def export_reconciliation(
             })
     
     try:
+        if download and format.lower() in EXPORT_MEDIA_TYPES:
+            if format.lower() == "excel":
+                buffer, filename = export_service.export_to_excel_buffer(export_data)
+            else:
+                buffer, filename = export_service.export_to_pdf_buffer(export_data)
+            return Response(
+                content=buffer.getvalue(),
+                media_type=EXPORT_MEDIA_TYPES[format.lower()],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+            )
+        
         if format.lower() == "excel":
             filepath = export_service.export_to_excel(export_data)
             filename = os.path.basename(filepath)
@@ -546,34 +580,33 @@ async def get_regularization_entries(
     reg_entries = db_service.get_regularization_entries(job_id)
     
     # Convert to dict format for response
-    entries_data = []
-    for entry in reg_entries:
-        entries_data.append({
-            "entry_number": entry.entry_number,
-            "date": entry.entry_date,
-            "description": entry.description,
-            "lines": entry.lines,
-            "total_debit": entry.total_debit,
-            "total_credit": entry.total_credit,
-            "is_balanced": entry.is_balanced
-        })
+    entries_data = [{
+        "entry_number": entry.entry_number,
+        "date": entry.entry_date,
+        "description": entry.description,
+        "lines": entry.lines,
+        "total_debit": entry.total_debit,
+        "total_credit": entry.total_credit,
+        "is_balanced": entry.is_balanced
+    } for entry in reg_entries]
     
     # Determine validation status from entries
-    all_balanced = all(entry.is_balanced for entry in reg_entries) if reg_entries else True
+    balanced_count = sum(1 for e in reg_entries if e.is_balanced)
     validation = {
-        "valid": all_balanced,
+        "valid": balanced_count == len(reg_entries),
         "total_entries": len(reg_entries),
-        "balanced_entries": sum(1 for e in reg_entries if e.is_balanced),
-        "unbalanced_entries": sum(1 for e in reg_entries if not e.is_balanced),
+        "balanced_entries": balanced_count,
+        "unbalanced_entries": len(reg_entries) - balanced_count,
         "errors": []
     }
     
-    return {
+    # Column values straight from the database are native types: no jsonable_encoder walk needed
+    return ORJSONResponse({
         "jobId": job_id,
         "entries": entries_data,
         "validation": validation,
         "totalEntries": len(entries_data)
-    }
+    })
 
 @router.get("/reconcile/{job_id}/regularization/export")
 async def export_regularization_csv(
@@ -618,7 +651,7 @@ async def list_reconciliations(
     db_service = DatabaseService(db)
     reconciliations = db_service.list_reconciliations(limit=limit)
     
-    return [
+    return ORJSONResponse([
         {
             "jobId": recon.id,
             "status": recon.status,
@@ -628,7 +661,7 @@ async def list_reconciliations(
             "coverageRatio": recon.coverage_ratio
         }
         for recon in reconciliations
-    ]
+    ])
 
 @router.get("/download/{filename}")
 async def download_file(filename: str):
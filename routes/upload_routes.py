@@ -2,7 +2,10 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from fastapi.responses import JSONResponse
 import os
 import uuid
+import asyncio
+import shutil
 from datetime import datetime
+import pandas as pd
 from sqlalchemy.orm import Session
 from services.file_processor import FileProcessor
 from services.database_service import DatabaseService
@@ -11,6 +14,8 @@ from config import UPLOAD_DIR
 from routes.auth_routes import get_current_user
 from db_models.users import User
 from database import get_db
+from db_models.all_models import bulk_insert_transactions
+from utils.date_parser import parse_date_to_python_date
 
 # Supported file extensions
 SUPPORTED_EXTENSIONS = ['.csv', '.pdf', '.xlsx', '.xls', '.png', '.jpg', '.jpeg']
@@ -21,12 +26,70 @@ file_processor = FileProcessor()
 # Ensure upload directory exists
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-@router.post("/upload/bank")
-async def upload_bank_file(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
-):
-    """Upload and process bank file (CSV, PDF, Excel, Image)"""
+# Copy block size when saving uploads: peak memory stays at one block whatever the file size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+def _save_upload(file: UploadFile, file_path: str):
+    """Stream the (already spooled) upload body to file_path in UPLOAD_CHUNK_SIZE blocks"""
+    file.file.seek(0)
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f, UPLOAD_CHUNK_SIZE)
+
+def _transaction_rows(df: pd.DataFrame, file_id: str, extra_column: str, extra_default: str) -> list:
+    """Row dicts for bulk_insert_transactions, each column converted once up front (no per-row casts)"""
+    if pd.api.types.is_datetime64_any_dtype(df['date']):
+        # Same result as parse_date_to_python_date on each Timestamp (NaT stays NaT)
+        dates = df['date'].dt.date
+    else:
+        dates = df['date'].map(parse_date_to_python_date)
+    extras = (
+        df[extra_column].fillna(extra_default).astype(str).tolist()
+        if extra_column in df.columns else [extra_default] * len(df)
+    )
+    return [
+        {
+            "id": tx_id,
+            "file_id": file_id,
+            "date": tx_date,
+            "amount": amount,
+            "description": description,
+            extra_column: extra
+        }
+        for tx_id, tx_date, amount, description, extra in zip(
+            df['id'].astype(str).tolist(),
+            dates.tolist(),
+            df['amount'].astype('float64').tolist(),
+            df['description'].fillna('').astype(str).tolist(),
+            extras
+        )
+    ]
+
+# Per file type: extra transaction column and its default when the file has none
+EXTRA_COLUMNS = {
+    "bank": ("currency", "TND"),
+    "accounting": ("account_code", ""),
+}
+
+def _store_upload(db: Session, df: pd.DataFrame, file_id: str, filename: str, file_path: str, file_type: str):
+    """Save the file record and its transactions in a single transaction"""
+    DatabaseService(db).save_uploaded_file(
+        filename=filename,
+        file_path=file_path,
+        file_type=file_type,
+        rows_count=len(df),
+        user_id="system",
+        file_id=file_id,
+        commit=False
+    )
+    
+    # Save transactions to database (no CSV needed)
+    extra_column, extra_default = EXTRA_COLUMNS[file_type]
+    rows = _transaction_rows(df, file_id, extra_column, extra_default)
+    bulk_insert_transactions(db, rows, is_bank=file_type == "bank")
+    db.commit()
+
+async def _handle_upload(file: UploadFile, db: Session, file_type: str):
+    """Save, parse, validate and store an uploaded bank or accounting file"""
     file_ext = os.path.splitext(file.filename)[1].lower()
     if file_ext not in SUPPORTED_EXTENSIONS:
         raise HTTPException(
@@ -38,48 +101,26 @@ async def upload_bank_file(
         upload_id = str(uuid.uuid4())
         file_path = os.path.join(UPLOAD_DIR, f"{upload_id}_{file.filename}")
         
-        # Save file
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        # Save file, off the event loop and without reading the whole body into memory
+        await asyncio.to_thread(_save_upload, file, file_path)
         
         # Process file (supports CSV, PDF, Excel, Images)
-        df = file_processor.process_file(file_path, "bank")
+        # pdfplumber parsing and AI fallbacks block: run them off the event loop
+        df = await asyncio.to_thread(file_processor.process_file, file_path, file_type)
         
         # Validate CSV structure
-        validation = file_processor.validate_csv_structure(df, "bank")
+        validation = file_processor.validate_csv_structure(df, file_type)
         if not validation["valid"]:
             raise HTTPException(status_code=400, detail=f"Invalid CSV structure: {validation['errors']}")
         
-        # Save to database
-        db_service = DatabaseService(db)
-        file_record = db_service.save_uploaded_file(
-            filename=file.filename,
-            file_path=file_path,
-            file_type="bank",
-            rows_count=len(df),
-            user_id="system"
-        )
-        
-        # Save transactions to database (no CSV needed)
-        from db_models.transactions import BankTransaction
-        from utils.date_parser import parse_date_to_python_date
-        for _, row in df.iterrows():
-            tx = BankTransaction(
-                id=str(row['id']),
-                file_id=file_record.id,
-                date=parse_date_to_python_date(row['date']),
-                amount=float(row['amount']),
-                description=str(row['description']),
-                currency=str(row.get('currency', 'TND'))
-            )
-            db.add(tx)
-        db.commit()
+        # Row building and the inserts block on the database: run them off the event loop
+        # upload_id doubles as the file id, known before the insert so nothing has to be read back
+        await asyncio.to_thread(_store_upload, db, df, upload_id, file.filename, file_path, file_type)
         
-        log_upload(file.filename, "bank", len(df))
+        log_upload(file.filename, file_type, len(df))
         
         return {
-            "uploadId": file_record.id,
+            "uploadId": upload_id,
             "filename": file.filename,
             "rowsCount": len(df),
             "preview": df.head(3).to_dict('records') if len(df) > 0 else [],
@@ -89,83 +130,24 @@ async def upload_bank_file(
     except Exception as e:
         import traceback
         error_trace = traceback.format_exc()
-        log_error(f"Bank file upload failed: {str(e)}\n{error_trace}", {"filename": file.filename})
-        print(f"ERROR uploading bank file: {str(e)}")
-        print(error_trace)
+        log_error(f"{file_type.capitalize()} file upload failed: {str(e)}\n{error_trace}", {"filename": file.filename})
         raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
+@router.post("/upload/bank")
+async def upload_bank_file(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db)
+):
+    """Upload and process bank file (CSV, PDF, Excel, Image)"""
+    return await _handle_upload(file, db, "bank")
+
 @router.post("/upload/accounting")
 async def upload_accounting_file(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
     """Upload and process accounting file (CSV, PDF, Excel, Image)"""
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in SUPPORTED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Format non supporté. Formats acceptés: {', '.join(SUPPORTED_EXTENSIONS)}"
-        )
-    
-    try:
-        upload_id = str(uuid.uuid4())
-        file_path = os.path.join(UPLOAD_DIR, f"{upload_id}_{file.filename}")
-        
-        # Save file
-        content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        # Process file (supports CSV, PDF, Excel, Images)
-        df = file_processor.process_file(file_path, "accounting")
-        
-        # Validate CSV structure
-        validation = file_processor.validate_csv_structure(df, "accounting")
-        if not validation["valid"]:
-            raise HTTPException(status_code=400, detail=f"Invalid CSV structure: {validation['errors']}")
-        
-        # Save to database
-        db_service = DatabaseService(db)
-        file_record = db_service.save_uploaded_file(
-            filename=file.filename,
-            file_path=file_path,
-            file_type="accounting",
-            rows_count=len(df),
-            user_id="system"
-        )
-        
-        # Save transactions to database (no CSV needed)
-        from db_models.transactions import AccountingTransaction
-        from utils.date_parser import parse_date_to_python_date
-        for _, row in df.iterrows():
-            tx = AccountingTransaction(
-                id=str(row['id']),
-                file_id=file_record.id,
-                date=parse_date_to_python_date(row['date']),
-                amount=float(row['amount']),
-                description=str(row['description']),
-                account_code=str(row.get('account_code', ''))
-            )
-            db.add(tx)
-        db.commit()
-        
-        log_upload(file.filename, "accounting", len(df))
-        
-        return {
-            "uploadId": file_record.id,
-            "filename": file.filename,
-            "rowsCount": len(df),
-            "preview": df.head(3).to_dict('records') if len(df) > 0 else [],
-            "validation": validation
-        }
-        
-    except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        log_error(f"Accounting file upload failed: {str(e)}\n{error_trace}", {"filename": file.filename})
-        print(f"ERROR uploading accounting file: {str(e)}")
-        print(error_trace)
-        raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+    return await _handle_upload(file, db, "accounting")
 
 @router.get("/uploads/{upload_id}")
 async def get_upload_info(
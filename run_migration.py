@@ -2,7 +2,26 @@
 Run database migrations
 """
 import sys
-from migrations.add_execution_time_column import upgrade
+from migrations.add_execution_time_column import upgrade as add_execution_time_column
+from migrations.add_uuid_server_default import upgrade as add_uuid_server_default
+from migrations.convert_validation_timestamps import upgrade as convert_validation_timestamps
+from migrations.convert_audit_flags_to_boolean import upgrade as convert_audit_flags_to_boolean
+from migrations.add_hot_path_indexes import upgrade as add_hot_path_indexes
+from migrations.convert_json_to_jsonb import upgrade as convert_json_to_jsonb
+from migrations.bound_text_columns import upgrade as bound_text_columns
+from migrations.set_hot_update_fillfactor import upgrade as set_hot_update_fillfactor
+
+# Applied in order
+MIGRATIONS = [
+    add_execution_time_column,
+    add_uuid_server_default,
+    convert_validation_timestamps,
+    convert_audit_flags_to_boolean,
+    add_hot_path_indexes,
+    convert_json_to_jsonb,
+    bound_text_columns,
+    set_hot_update_fillfactor,
+]
 
 if __name__ == "__main__":
     print("=" * 50)
@@ -10,7 +29,8 @@ if __name__ == "__main__":
     print("=" * 50)
     
     try:
-        upgrade()
+        for upgrade in MIGRATIONS:
+            upgrade()
         print("\n✓ All migrations completed successfully!")
         sys.exit(0)
     except Exception as e:
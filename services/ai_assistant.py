@@ -1,35 +1,61 @@
-import google.generativeai as genai
-import anthropic
-from config import GEMINI_API_KEY, CLAUDE_API_KEY, AI_CONFIG
-from utils.logger import log_ai_call
+from config import GEMINI_API_KEY, CLAUDE_API_KEY, AI_CONFIG, AI_MEMORY_CACHE_SIZE
+from services import llm_cache
+from utils.logger import logger, log_ai_call
+import hashlib
 import json
 import time
-from typing import Dict, Optional
+import numpy as np
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
 from threading import Lock
-from collections import deque
+from collections import OrderedDict, deque
 
-# Initialize AI providers (3-tier fallback: Gemini → Claude → Backend)
-gemini_model = None
-claude_client = None
+# AI providers (3-tier fallback: Gemini → Claude → Backend), initialized on first use:
+# the SDK imports are heavy and most processes (workers, scripts) never call the AI
+_providers = None
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    gemini_model = genai.GenerativeModel(AI_CONFIG["gemini_model"])
+def get_ai_providers():
+    """Return (gemini_model, claude_client), importing and configuring the SDKs once"""
+    global _providers
+    if _providers is None:
+        gemini_model = None
+        claude_client = None
+        
+        if GEMINI_API_KEY:
+            import google.generativeai as genai
+            genai.configure(api_key=GEMINI_API_KEY)
+            gemini_model = genai.GenerativeModel(AI_CONFIG["gemini_model"])
+        
+        if CLAUDE_API_KEY:
+            import anthropic
+            claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+        
+        _providers = (gemini_model, claude_client)
+    return _providers
 
-if CLAUDE_API_KEY:
-    claude_client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
+# AI Performance tracking (Cahier des Charges)
+@dataclass(slots=True)
+class AIMetrics:
+    total_calls: int = 0
+    successful_calls: int = 0
+    failed_calls: int = 0
+    total_response_time: float = 0.0
+    hallucinations_detected: int = 0
+    fallback_used: int = 0
 
-model = gemini_model  # Keep for backward compatibility
+ai_metrics = AIMetrics()
+_metrics_lock = Lock()
 
-# AI Performance tracking (Cahier des Charges)
-ai_metrics = {
-    "total_calls": 0,
-    "successful_calls": 0,
-    "failed_calls": 0,
-    "total_response_time": 0,
-    "hallucinations_detected": 0,
-    "fallback_used": 0
-}
+def _record_call(success: bool = False, failed: bool = False, fallback: bool = False,
+                 response_time: float = 0.0, hallucinations: int = 0):
+    """Account for one AI call: every counter updated together, so readers never see half an update"""
+    with _metrics_lock:
+        ai_metrics.total_calls += 1
+        ai_metrics.successful_calls += success
+        ai_metrics.failed_calls += failed
+        ai_metrics.fallback_used += failed or fallback
+        ai_metrics.total_response_time += response_time
+        ai_metrics.hallucinations_detected += hallucinations
 
 # Rate limiting: 10 requests per minute for Gemini free tier
 rate_limit_lock = Lock()
@@ -37,8 +63,109 @@ request_timestamps = deque(maxlen=10)
 MAX_REQUESTS_PER_MINUTE = 8  # Conservative limit (10 is max, use 8 for safety)
 MIN_REQUEST_INTERVAL = 60.0 / MAX_REQUESTS_PER_MINUTE  # ~7.5 seconds
 
+# Categories accepted from the categorize functions, anything else is a hallucination
+VALID_CATEGORIES = ["FRAIS_BANCAIRE", "VIREMENT_RECU", "VIREMENT_EMIS",
+                    "CHEQUE", "REMISE_CHEQUE", "PRELEVEMENT", "CARTE_BANCAIRE", "AUTRE"]
+
+# AI results by input: in-process LRU in front of the on-disk llm_cache (shared across processes)
+_result_cache = OrderedDict()
+_result_cache_lock = Lock()
+
+def _cache_key(function: str, *inputs) -> str:
+    """Cache key for an AI result: same inputs up to case/whitespace give the same answer"""
+    normalized = "|".join(" ".join(str(value).lower().split()) for value in inputs)
+    return f"{function}_{hashlib.sha1(normalized.encode('utf-8')).hexdigest()}"
+
+def _cached_result(key: str) -> Optional[dict]:
+    with _result_cache_lock:
+        result = _result_cache.get(key)
+        if result is not None:
+            _result_cache.move_to_end(key)
+            return dict(result)
+    cached = llm_cache.get(key)
+    if cached is None:
+        return None
+    try:
+        result = json.loads(cached)
+    except ValueError:
+        return None
+    _remember_result(key, result)
+    return dict(result)
+
+def _remember_result(key: str, result: dict):
+    with _result_cache_lock:
+        _result_cache[key] = result
+        _result_cache.move_to_end(key)
+        if len(_result_cache) > AI_MEMORY_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+def _store_result(key: str, result: dict):
+    """Cache a successful AI result (fallback results are never stored)"""
+    _remember_result(key, dict(result))
+    llm_cache.set(key, json.dumps(result))
+
+# Local sentence-embedding model for label similarity, loaded on first use (None if not installed)
+_embedding_model = None
+_embedding_model_loaded = False
+_embedding_model_lock = Lock()
+
+def get_embedding_model():
+    """Return the SentenceTransformer model, or None when sentence-transformers is not installed"""
+    global _embedding_model, _embedding_model_loaded
+    with _embedding_model_lock:
+        if not _embedding_model_loaded:
+            # Loaded flag set whatever happens: a failed load (not installed, no network to fetch
+            # the model, OOM...) falls back to the AI providers for good instead of retrying per call
+            _embedding_model_loaded = True
+            try:
+                from sentence_transformers import SentenceTransformer
+                _embedding_model = SentenceTransformer(AI_CONFIG["embedding_model"])
+            except ImportError:
+                _embedding_model = None
+            except Exception as e:
+                logger.warning("Could not load embedding model %s, using AI providers: %s",
+                               AI_CONFIG["embedding_model"], e)
+                _embedding_model = None
+    return _embedding_model
+
+def _embedding_similarities(pairs: List[Tuple[str, str]]) -> Optional[np.ndarray]:
+    """Cosine similarity of each label pair, clipped to [0, 1], or None without a local model"""
+    model = get_embedding_model()
+    if model is None:
+        return None
+    # Each distinct label is encoded once, however many pairs it appears in
+    labels = list(dict.fromkeys(label for pair in pairs for label in pair))
+    index = {label: i for i, label in enumerate(labels)}
+    embeddings = model.encode(labels, convert_to_numpy=True, normalize_embeddings=True)
+    left = embeddings[[index[label1] for label1, _ in pairs]]
+    right = embeddings[[index[label2] for _, label2 in pairs]]
+    return np.clip(np.einsum("ij,ij->i", left, right), 0.0, 1.0)
+
+def _compare_labels_locally(pairs: List[Tuple[str, str]]) -> Optional[List[Dict]]:
+    """compare_labels results from the local embedding model, or None to use the AI providers"""
+    start_time = time.time()
+    try:
+        scores = _embedding_similarities(pairs)
+    except Exception as e:
+        log_ai_call("compare_labels_local", {"error": str(e)}, 0.0)
+        return None
+    if scores is None:
+        return None
+    response_time = (time.time() - start_time) * 1000
+    _record_call(success=True, response_time=response_time)
+    return [
+        {
+            "score": float(score),
+            "response_time_ms": int(response_time),
+            "fallback": False,
+            "success": True
+        }
+        for score in scores
+    ]
+
 def call_ai(prompt: str, max_tokens: int = 50) -> str:
     """3-tier AI fallback: Gemini → Claude → Exception"""
+    gemini_model, claude_client = get_ai_providers()
     
     # Tier 1: Try Gemini first
     if gemini_model:
@@ -87,6 +214,14 @@ def call_ai(prompt: str, max_tokens: int = 50) -> str:
     else:
         raise Exception("No AI provider available")
 
+def _extract_json(response_text: str):
+    """Parse the JSON in a model response (handle markdown code blocks)"""
+    if '```json' in response_text:
+        response_text = response_text.split('```json')[1].split('```')[0].strip()
+    elif '```' in response_text:
+        response_text = response_text.split('```')[1].split('```')[0].strip()
+    return json.loads(response_text)
+
 def wait_for_rate_limit():
     """Enforce rate limiting to prevent quota errors"""
     with rate_limit_lock:
@@ -107,12 +242,24 @@ def wait_for_rate_limit():
         request_timestamps.append(time.time())
 
 def compare_labels(label1: str, label2: str) -> Dict:
-    """Compare similarity between two transaction labels using AI with monitoring"""
-    ai_metrics["total_calls"] += 1
+    """Compare similarity between two transaction labels using AI with monitoring
+
+    Uses the local embedding model when available, the AI providers otherwise.
+    """
+    local = _compare_labels_locally([(label1, label2)])
+    if local is not None:
+        return local[0]
+    
+    cache_key = _cache_key("compare", label1, label2)
+    cached = _cached_result(cache_key)
+    if cached is not None:
+        return cached
+    
     start_time = time.time()
+    hallucinations = 0
     
-    if not model:
-        ai_metrics["fallback_used"] += 1
+    if not get_ai_providers()[0]:
+        _record_call(fallback=True)
         return {"score": 0.0, "fallback": True, "response_time_ms": 0}
     
     # Rate limiting
@@ -134,26 +281,26 @@ Number only:"""
         score_text = call_ai(prompt, max_tokens=10).strip()
         
         response_time = (time.time() - start_time) * 1000  # milliseconds
-        ai_metrics["total_response_time"] += response_time
         score = float(score_text)
         
         # Hallucination detection: score must be between 0 and 1
         if score < 0 or score > 1:
-            ai_metrics["hallucinations_detected"] += 1
+            hallucinations += 1
             score = max(0.0, min(1.0, score))
         
-        ai_metrics["successful_calls"] += 1
+        _record_call(success=True, response_time=response_time, hallucinations=hallucinations)
         log_ai_call("compare_labels", {"label1": label1, "label2": label2}, score)
         
-        return {
+        result = {
             "score": max(0.0, min(1.0, score)),
             "response_time_ms": int(response_time),
             "fallback": False,
             "success": True
         }
+        _store_result(cache_key, result)
+        return result
     except Exception as e:
-        ai_metrics["failed_calls"] += 1
-        ai_metrics["fallback_used"] += 1
+        _record_call(failed=True, hallucinations=hallucinations)
         response_time = (time.time() - start_time) * 1000
         log_ai_call("compare_labels", {"error": str(e)}, 0.0)
         
@@ -166,13 +313,117 @@ Number only:"""
             "error": str(e)
         }
 
+def compare_labels_batch(pairs: List[Tuple[str, str]]) -> List[Dict]:
+    """compare_labels for many label pairs, AI_CONFIG["batch_size"] pairs per AI request
+
+    Scored in one pass by the local embedding model when available. Otherwise cached
+    pairs are not sent, repeated pairs are sent once.
+    """
+    if not pairs:
+        return []
+    local = _compare_labels_locally(pairs)
+    if local is not None:
+        return local
+    
+    keys = [_cache_key("compare", label1, label2) for label1, label2 in pairs]
+    by_key = {}
+    missing = {}
+    for key, pair in zip(keys, pairs):
+        if key in by_key or key in missing:
+            continue
+        cached = _cached_result(key)
+        if cached is not None:
+            by_key[key] = cached
+        else:
+            missing[key] = pair
+    
+    missing_keys = list(missing)
+    batch_size = AI_CONFIG["batch_size"]
+    for start in range(0, len(missing_keys), batch_size):
+        chunk_keys = missing_keys[start:start + batch_size]
+        for key, result in zip(chunk_keys, _compare_labels_chunk([missing[key] for key in chunk_keys])):
+            if not result["fallback"]:
+                _store_result(key, result)
+            by_key[key] = result
+    return [by_key[key] for key in keys]
+
+def _compare_labels_chunk(pairs: List[Tuple[str, str]]) -> List[Dict]:
+    start_time = time.time()
+    hallucinations = 0
+    
+    if not get_ai_providers()[0]:
+        _record_call(fallback=True)
+        return [{"score": 0.0, "fallback": True, "response_time_ms": 0} for _ in pairs]
+    
+    # Rate limiting
+    wait_for_rate_limit()
+    
+    listing = "\n".join(f'{i}. "{label1}" vs "{label2}"' for i, (label1, label2) in enumerate(pairs, 1))
+    prompt = f"""Compare similarity between the bank transaction labels of each numbered pair:
+{listing}
+
+For each pair, a number between 0 and 1 representing similarity.
+Examples:
+- "VIREMENT SALAIRE" vs "SALAIRE NOVEMBRE" = 0.85
+- "CHEQUE 123456" vs "CHEQUE 654321" = 0.70
+- "FRAIS BANCAIRE" vs "COMMISSION" = 0.60
+
+Return only a JSON array of {len(pairs)} numbers, in pair order:"""
+
+    try:
+        response_text = call_ai(prompt, max_tokens=8 * len(pairs)).strip()
+        
+        response_time = (time.time() - start_time) * 1000  # milliseconds
+        scores = [float(score) for score in _extract_json(response_text)]
+        if len(scores) != len(pairs):
+            hallucinations += 1
+            raise ValueError(f"Expected {len(pairs)} scores, got {len(scores)}")
+        
+        # Hallucination detection: score must be between 0 and 1
+        if any(score < 0 or score > 1 for score in scores):
+            hallucinations += 1
+        
+        _record_call(success=True, response_time=response_time, hallucinations=hallucinations)
+        log_ai_call("compare_labels_batch", {"pairs": len(pairs)}, scores)
+        
+        return [
+            {
+                "score": max(0.0, min(1.0, score)),
+                "response_time_ms": int(response_time),
+                "fallback": False,
+                "success": True
+            }
+            for score in scores
+        ]
+    except Exception as e:
+        _record_call(failed=True, hallucinations=hallucinations)
+        response_time = (time.time() - start_time) * 1000
+        log_ai_call("compare_labels_batch", {"error": str(e)}, 0.0)
+        
+        # Fallback to manual mode
+        return [
+            {
+                "score": 0.0,
+                "response_time_ms": int(response_time),
+                "fallback": True,
+                "success": False,
+                "error": str(e)
+            }
+            for _ in pairs
+        ]
+
 def categorize_transaction(description: str) -> dict:
     """Categorize transaction into predefined categories with monitoring"""
-    ai_metrics["total_calls"] += 1
+    cache_key = _cache_key("categorize", description)
+    cached = _cached_result(cache_key)
+    if cached is not None:
+        return cached
+    
     start_time = time.time()
+    hallucinations = 0
     
-    if not model:
-        ai_metrics["fallback_used"] += 1
+    if not get_ai_providers()[0]:
+        _record_call(fallback=True)
         return {"category": "AUTRE", "confidence": 0.0, "fallback": True}
     
     # Rate limiting
@@ -198,38 +449,115 @@ Return JSON format: {{"category": "CATEGORY_NAME", "confidence": 0.85}}"""
         response_text = call_ai(prompt, max_tokens=50).strip()
         
         response_time = (time.time() - start_time) * 1000
-        ai_metrics["total_response_time"] += response_time
         
-        # Extract JSON from response (handle markdown code blocks)
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
-        
-        result = json.loads(response_text)
+        result = _extract_json(response_text)
         
         # Validate category is in allowed list
-        valid_categories = ["FRAIS_BANCAIRE", "VIREMENT_RECU", "VIREMENT_EMIS", 
-                          "CHEQUE", "REMISE_CHEQUE", "PRELEVEMENT", "CARTE_BANCAIRE", "AUTRE"]
-        if result.get("category") not in valid_categories:
-            ai_metrics["hallucinations_detected"] += 1
+        if result.get("category") not in VALID_CATEGORIES:
+            hallucinations += 1
             result["category"] = "AUTRE"
         
-        ai_metrics["successful_calls"] += 1
+        _record_call(success=True, response_time=response_time, hallucinations=hallucinations)
         result["response_time_ms"] = int(response_time)
         result["fallback"] = False
         log_ai_call("categorize_transaction", {"description": description}, result)
+        _store_result(cache_key, result)
         return result
     except Exception as e:
-        ai_metrics["failed_calls"] += 1
-        ai_metrics["fallback_used"] += 1
+        _record_call(failed=True, hallucinations=hallucinations)
         response_time = (time.time() - start_time) * 1000
         log_ai_call("categorize_transaction", {"error": str(e)}, {"category": "AUTRE", "confidence": 0.0})
         return {"category": "AUTRE", "confidence": 0.0, "fallback": True, "response_time_ms": int(response_time)}
 
+def categorize_transactions_batch(descriptions: List[str]) -> List[dict]:
+    """categorize_transaction for many descriptions, AI_CONFIG["batch_size"] per AI request
+
+    Cached descriptions are not sent, repeated descriptions are sent once and share the same result.
+    """
+    keys = [_cache_key("categorize", description) for description in descriptions]
+    by_key = {}
+    missing = {}
+    for key, description in zip(keys, descriptions):
+        if key in by_key or key in missing:
+            continue
+        cached = _cached_result(key)
+        if cached is not None:
+            by_key[key] = cached
+        else:
+            missing[key] = description
+    
+    missing_keys = list(missing)
+    batch_size = AI_CONFIG["batch_size"]
+    for start in range(0, len(missing_keys), batch_size):
+        chunk_keys = missing_keys[start:start + batch_size]
+        for key, result in zip(chunk_keys, _categorize_chunk([missing[key] for key in chunk_keys])):
+            if not result["fallback"]:
+                _store_result(key, result)
+            by_key[key] = result
+    return [by_key[key] for key in keys]
+
+def _categorize_chunk(descriptions: List[str]) -> List[dict]:
+    start_time = time.time()
+    hallucinations = 0
+    
+    if not get_ai_providers()[0]:
+        _record_call(fallback=True)
+        return [{"category": "AUTRE", "confidence": 0.0, "fallback": True} for _ in descriptions]
+    
+    # Rate limiting
+    wait_for_rate_limit()
+    
+    listing = "\n".join(f'{i}. "{description}"' for i, description in enumerate(descriptions, 1))
+    prompt = f"""Categorize each of these Tunisian bank transactions into ONE category:
+
+Categories:
+- FRAIS_BANCAIRE (bank fees, commissions)
+- VIREMENT_RECU (incoming transfer)
+- VIREMENT_EMIS (outgoing transfer)  
+- CHEQUE (check payment)
+- REMISE_CHEQUE (check deposit)
+- PRELEVEMENT (direct debit)
+- CARTE_BANCAIRE (card payment)
+- AUTRE (other)
+
+Transactions:
+{listing}
+
+Return a JSON array of {len(descriptions)} objects, in transaction order: [{{"category": "CATEGORY_NAME", "confidence": 0.85}}, ...]"""
+
+    try:
+        response_text = call_ai(prompt, max_tokens=30 * len(descriptions)).strip()
+        
+        response_time = (time.time() - start_time) * 1000
+        
+        results = _extract_json(response_text)
+        if not isinstance(results, list) or len(results) != len(descriptions):
+            hallucinations += 1
+            raise ValueError(f"Expected {len(descriptions)} categories")
+        
+        for result in results:
+            # Validate category is in allowed list
+            if result.get("category") not in VALID_CATEGORIES:
+                hallucinations += 1
+                result["category"] = "AUTRE"
+            result["response_time_ms"] = int(response_time)
+            result["fallback"] = False
+        
+        _record_call(success=True, response_time=response_time, hallucinations=hallucinations)
+        log_ai_call("categorize_transactions_batch", {"descriptions": len(descriptions)}, results)
+        return results
+    except Exception as e:
+        _record_call(failed=True, hallucinations=hallucinations)
+        response_time = (time.time() - start_time) * 1000
+        log_ai_call("categorize_transactions_batch", {"error": str(e)}, {"category": "AUTRE", "confidence": 0.0})
+        return [
+            {"category": "AUTRE", "confidence": 0.0, "fallback": True, "response_time_ms": int(response_time)}
+            for _ in descriptions
+        ]
+
 def validate_pcn_account(account_code: str) -> dict:
     """Validate PCN account code for Tunisia"""
-    if not model:
+    if not get_ai_providers()[0]:
         return {"valid": False, "confidence": 0.0}
     
     prompt = f"""Is "{account_code}" a valid Tunisian PCN account code?
@@ -248,13 +576,7 @@ Return JSON: {{"valid": true/false, "confidence": 0.90}}"""
     try:
         response_text = call_ai(prompt, max_tokens=30).strip()
         
-        # Extract JSON from response (handle markdown code blocks)
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
-        
-        result = json.loads(response_text)
+        result = _extract_json(response_text)
         log_ai_call("validate_pcn_account", {"account_code": account_code}, result)
         return result
     except Exception as e:
@@ -263,11 +585,16 @@ Return JSON: {{"valid": true/false, "confidence": 0.90}}"""
 
 def suggest_account_mapping(description: str, amount: float) -> dict:
     """Suggest PCN account for a transaction with monitoring"""
-    ai_metrics["total_calls"] += 1
+    cache_key = _cache_key("account", description, amount)
+    cached = _cached_result(cache_key)
+    if cached is not None:
+        return cached
+    
     start_time = time.time()
+    hallucinations = 0
     
-    if not model:
-        ai_metrics["fallback_used"] += 1
+    if not get_ai_providers()[0]:
+        _record_call(fallback=True)
         return {"account": "580000", "confidence": 0.0, "fallback": True}
     
     # Rate limiting
@@ -290,57 +617,48 @@ Return JSON: {{"account": "512000", "confidence": 0.80}}"""
         response_text = call_ai(prompt, max_tokens=30).strip()
         
         response_time = (time.time() - start_time) * 1000
-        ai_metrics["total_response_time"] += response_time
-        
-        # Extract JSON from response (handle markdown code blocks)
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
         
-        result = json.loads(response_text)
+        result = _extract_json(response_text)
         
         # Validate account format (6 digits)
         if not result.get("account", "").isdigit() or len(result.get("account", "")) != 6:
-            ai_metrics["hallucinations_detected"] += 1
+            hallucinations += 1
             result["account"] = "580000"  # Fallback to suspense
         
-        ai_metrics["successful_calls"] += 1
+        _record_call(success=True, response_time=response_time, hallucinations=hallucinations)
         result["response_time_ms"] = int(response_time)
         result["fallback"] = False
         log_ai_call("suggest_account_mapping", {"description": description, "amount": amount}, result)
+        _store_result(cache_key, result)
         return result
     except Exception as e:
-        ai_metrics["failed_calls"] += 1
-        ai_metrics["fallback_used"] += 1
+        _record_call(failed=True, hallucinations=hallucinations)
         response_time = (time.time() - start_time) * 1000
         log_ai_call("suggest_account_mapping", {"error": str(e)}, {"account": "580000", "confidence": 0.0})
         return {"account": "580000", "confidence": 0.0, "fallback": True, "response_time_ms": int(response_time)}
 
 def get_ai_metrics() -> Dict:
     """Get AI performance metrics for monitoring dashboard"""
-    avg_response_time = (ai_metrics["total_response_time"] / ai_metrics["total_calls"]) if ai_metrics["total_calls"] > 0 else 0
-    success_rate = (ai_metrics["successful_calls"] / ai_metrics["total_calls"] * 100) if ai_metrics["total_calls"] > 0 else 0
+    # Consistent copy of the counters: AI calls in worker threads keep updating them meanwhile
+    with _metrics_lock:
+        snapshot = asdict(ai_metrics)
+    total_calls = snapshot["total_calls"]
+    avg_response_time = (snapshot["total_response_time"] / total_calls) if total_calls > 0 else 0
+    success_rate = (snapshot["successful_calls"] / total_calls * 100) if total_calls > 0 else 0
     
     return {
-        "total_calls": ai_metrics["total_calls"],
-        "successful_calls": ai_metrics["successful_calls"],
-        "failed_calls": ai_metrics["failed_calls"],
+        "total_calls": total_calls,
+        "successful_calls": snapshot["successful_calls"],
+        "failed_calls": snapshot["failed_calls"],
         "success_rate": round(success_rate, 2),
         "avg_response_time_ms": round(avg_response_time, 2),
-        "hallucinations_detected": ai_metrics["hallucinations_detected"],
-        "fallback_used": ai_metrics["fallback_used"],
+        "hallucinations_detected": snapshot["hallucinations_detected"],
+        "fallback_used": snapshot["fallback_used"],
         "status": "healthy" if success_rate > 90 else "degraded" if success_rate > 70 else "critical"
     }
 
 def reset_ai_metrics():
     """Reset AI metrics (for testing or new session)"""
     global ai_metrics
-    ai_metrics = {
-        "total_calls": 0,
-        "successful_calls": 0,
-        "failed_calls": 0,
-        "total_response_time": 0,
-        "hallucinations_detected": 0,
-        "fallback_used": 0
-    }
\ No newline at end of file
+    with _metrics_lock:
+        ai_metrics = AIMetrics()
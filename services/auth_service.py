@@ -1,12 +1,23 @@
 from datetime import datetime, timedelta
+from dataclasses import dataclass
 from typing import Optional
+import hashlib
+import threading
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 from db_models.users import User
 from config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2 (C backend) for new hashes; existing bcrypt hashes still verify and are upgraded on login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=4
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -16,8 +27,15 @@ def get_password_hash(password: str) -> str:
 
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     user = db.query(User).filter(User.username == username).first()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
         return None
+    valid, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        # Legacy bcrypt hash: re-hash with argon2 now that we have the plain password
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -30,16 +48,75 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
+def decode_token(token: str) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            return None
-        return username
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
 
+def verify_token(token: str) -> Optional[str]:
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    username: str = payload.get("sub")
+    if username is None:
+        return None
+    return username
+
+# Authenticated users cached per token for a short time: repeat requests skip the JWT decode and the users query
+USER_CACHE_TTL_SECONDS = 30
+USER_CACHE_MAX_SIZE = 10_000
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """Detached snapshot of the authenticated user, safe to share between requests"""
+    id: str
+    username: str
+    email: str
+    full_name: Optional[str]
+    role: str
+    is_active: bool
+
+# blake2b(token) -> (monotonic expiry, CurrentUser); tokens themselves are never kept
+_user_cache = {}
+_user_cache_lock = threading.Lock()
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def get_cached_user(token: str) -> Optional[CurrentUser]:
+    entry = _user_cache.get(_token_key(token))
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return entry[1]
+
+def cache_user(token: str, user: User, token_exp: Optional[float] = None) -> CurrentUser:
+    """Snapshot user for this token, never past the token's own expiry"""
+    snapshot = CurrentUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        full_name=user.full_name,
+        role=user.role,
+        is_active=user.is_active
+    )
+    ttl = USER_CACHE_TTL_SECONDS
+    if token_exp is not None:
+        ttl = min(ttl, token_exp - time.time())
+    if ttl <= 0:
+        return snapshot
+    
+    now = time.monotonic()
+    with _user_cache_lock:
+        if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+            for key in [key for key, (expires_at, _) in _user_cache.items() if expires_at <= now]:
+                del _user_cache[key]
+            if len(_user_cache) >= USER_CACHE_MAX_SIZE:
+                # Still full of live entries: drop the oldest
+                del _user_cache[next(iter(_user_cache))]
+        _user_cache[_token_key(token)] = (now + ttl, snapshot)
+    return snapshot
+
 def create_user(db: Session, username: str, email: str, password: str, full_name: str, role: str = "user") -> User:
     hashed_password = get_password_hash(password)
     user = User(
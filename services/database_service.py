@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from db_models.reconciliation import Reconciliation, Match, SuspenseItem
 from db_models.regularization import RegularizationEntry
 from db_models.files import UploadedFile
@@ -7,7 +7,7 @@ from db_models.audit import AuditLog
 from db_models.performance import PerformanceMetrics
 from typing import Optional, List
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
 class DatabaseService:
     """Production-ready database service for reconciliation data"""
@@ -98,7 +98,11 @@ class DatabaseService:
         """Get paginated matches for reconciliation"""
         query = self.db.query(Match).filter(Match.reconciliation_id == recon_id)
         total = query.count()
-        matches = query.offset((page - 1) * limit).limit(limit).all()
+        # Transactions loaded in the same query, callers read them for every match
+        matches = query.options(
+            joinedload(Match.bank_transaction),
+            joinedload(Match.accounting_transaction)
+        ).order_by(Match.id).offset((page - 1) * limit).limit(limit).all()
         return matches, total
     
     def validate_match(self, match_id: str, action: str, user_id: str, 
@@ -108,7 +112,7 @@ class DatabaseService:
         if match:
             match.status = "validated" if action == "confirm" else "rejected"
             match.validated_by = user_id
-            match.validated_at = datetime.utcnow().isoformat()
+            match.validated_at = datetime.now(timezone.utc)
             match.validation_comment = comment
             
             # Log audit trail
@@ -152,6 +156,23 @@ class DatabaseService:
             SuspenseItem.reconciliation_id == recon_id
         ).all()
     
+    def get_suspense_transactions(self, suspense_items: List[SuspenseItem]) -> dict:
+        """Transactions behind suspense items, keyed by suspense item id (one IN query per table)"""
+        bank_ids = [item.transaction_id for item in suspense_items if item.transaction_type == 'bank']
+        acc_ids = [item.transaction_id for item in suspense_items if item.transaction_type != 'bank']
+        
+        bank_map = {
+            tx.id: tx for tx in self.db.query(BankTransaction).filter(BankTransaction.id.in_(bank_ids)).all()
+        } if bank_ids else {}
+        acc_map = {
+            tx.id: tx for tx in self.db.query(AccountingTransaction).filter(AccountingTransaction.id.in_(acc_ids)).all()
+        } if acc_ids else {}
+        
+        return {
+            item.id: (bank_map if item.transaction_type == 'bank' else acc_map).get(item.transaction_id)
+            for item in suspense_items
+        }
+    
     def resolve_suspense(self, suspense_id: str, user_id: str, 
                         resolution: str, comment: str = None) -> SuspenseItem:
         """Resolve a suspense item"""
@@ -159,7 +180,7 @@ class DatabaseService:
         if suspense:
             suspense.status = "resolved"
             suspense.resolved_by = user_id
-            suspense.resolved_at = datetime.utcnow().isoformat()
+            suspense.resolved_at = datetime.now(timezone.utc)
             suspense.resolution_comment = comment
             
             self.create_audit_log(
@@ -177,9 +198,15 @@ class DatabaseService:
     # ============ FILE OPERATIONS ============
     
     def save_uploaded_file(self, filename: str, file_path: str, file_type: str, 
-                          rows_count: int, user_id: str) -> UploadedFile:
-        """Save uploaded file metadata"""
+                          rows_count: int, user_id: str, file_id: Optional[str] = None,
+                          commit: bool = True) -> UploadedFile:
+        """Save uploaded file metadata
+
+        With commit=False the row is only flushed, so the caller can commit it together
+        with the file's transactions.
+        """
         file_obj = UploadedFile(
+            id=file_id,
             filename=filename,
             file_path=file_path,
             file_type=file_type,
@@ -188,6 +215,9 @@ class DatabaseService:
             status="processed"
         )
         self.db.add(file_obj)
+        if not commit:
+            self.db.flush()
+            return file_obj
         self.db.commit()
         self.db.refresh(file_obj)
         return file_obj
@@ -249,7 +279,7 @@ class DatabaseService:
             ip_address="0.0.0.0",
             user_agent="system",
             event_type="reconciliation",
-            success="true"
+            success=True
         )
         self.db.add(audit)
         self.db.commit()
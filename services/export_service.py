@@ -13,6 +13,8 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
 from datetime import datetime
+from typing import Tuple
+import io
 import os
 
 class ExportService:
@@ -28,7 +30,18 @@ class ExportService:
             filename = f"rapprochement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         
         filepath = os.path.join(self.storage_path, filename)
-        
+        self._build_workbook(reconciliation_data).save(filepath)
+        return filepath
+    
+    def export_to_excel_buffer(self, reconciliation_data: dict) -> Tuple[io.BytesIO, str]:
+        """Export reconciliation to an in-memory Excel file, returns (buffer, suggested filename)"""
+        buffer = io.BytesIO()
+        self._build_workbook(reconciliation_data).save(buffer)
+        buffer.seek(0)
+        return buffer, f"rapprochement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    
+    def _build_workbook(self, reconciliation_data: dict) -> Workbook:
+        """Build the report workbook (summary, matches, suspense, regularization sheets)"""
         # Create workbook
         wb = Workbook()
         wb.remove(wb.active)  # Remove default sheet
@@ -46,9 +59,7 @@ class ExportService:
         if "regularization_entries" in reconciliation_data:
             self._create_regularization_sheet(wb, reconciliation_data)
         
-        # Save workbook
-        wb.save(filepath)
-        return filepath
+        return wb
     
     def _create_summary_sheet(self, wb: Workbook, data: dict):
         """Create summary sheet with key metrics"""
@@ -259,9 +270,20 @@ class ExportService:
             filename = f"rapprochement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         
         filepath = os.path.join(self.storage_path, filename)
-        
+        self._build_pdf(filepath, reconciliation_data)
+        return filepath
+    
+    def export_to_pdf_buffer(self, reconciliation_data: dict) -> Tuple[io.BytesIO, str]:
+        """Export reconciliation to an in-memory PDF, returns (buffer, suggested filename)"""
+        buffer = io.BytesIO()
+        self._build_pdf(buffer, reconciliation_data)
+        buffer.seek(0)
+        return buffer, f"rapprochement_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    
+    def _build_pdf(self, target, reconciliation_data: dict):
+        """Render the PDF report into target (a path or a binary file object)"""
         # Create PDF
-        doc = SimpleDocTemplate(filepath, pagesize=landscape(A4))
+        doc = SimpleDocTemplate(target, pagesize=landscape(A4), pageCompression=1)
         elements = []
         styles = getSampleStyleSheet()
         
@@ -372,7 +394,6 @@ class ExportService:
         
         # Build PDF
         doc.build(elements)
-        return filepath
     
     def export_regularization_to_csv(self, entries: list, filename: str = None) -> str:
         """Export regularization entries to CSV for accounting software import"""
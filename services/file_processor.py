@@ -1,7 +1,6 @@
 import pandas as pd
 import io
 from typing import Dict, Any
-import uuid
 import os
 from datetime import datetime
 from parsers.biat_parser import BIATPDFParser
@@ -9,18 +8,7 @@ from parsers.intelligent_parser import IntelligentPDFParser
 from services.data_fixer import UltimateDataFixer
 from services.tunisian_config import TunisianBankConfig
 from utils.date_parser import parse_date_universal
-try:
-    import PyPDF2
-    import pdfplumber
-except ImportError:
-    PyPDF2 = None
-    pdfplumber = None
-try:
-    from PIL import Image
-    import pytesseract
-except ImportError:
-    Image = None
-    pytesseract = None
+from utils.helpers import generate_unique_ids
 
 class FileProcessor:
     def __init__(self):
@@ -73,7 +61,7 @@ class FileProcessor:
             for col in required_cols:
                 if col not in df.columns:
                     if col == 'id':
-                        df['id'] = [str(uuid.uuid4()) for _ in range(len(df))]
+                        df['id'] = generate_unique_ids(len(df))
                     elif col == 'date':
                         df['date'] = pd.Timestamp.now().strftime('%Y-%m-%d')
                     elif col == 'description':
@@ -112,7 +100,11 @@ class FileProcessor:
     
     def parse_image(self, content: bytes, file_type: str) -> pd.DataFrame:
         """Extract data from image using OCR"""
-        if Image is None or pytesseract is None:
+        # Imported here: OCR is optional and rarely used, keep it off the startup path
+        try:
+            from PIL import Image
+            import pytesseract
+        except ImportError:
             raise ValueError("Image OCR support not installed. Install: pip install Pillow pytesseract")
         
         try:
@@ -158,7 +150,7 @@ class FileProcessor:
             df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
             df['amount'] = df['credit'] - df['debit']
         
-        df['id'] = [str(uuid.uuid4()) for _ in range(len(df))]
+        df['id'] = generate_unique_ids(len(df))
         return self._clean_dataframe(df)
     
     def _normalize_accounting_data(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -185,30 +177,38 @@ class FileProcessor:
             df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
             df['amount'] = df.apply(lambda row: row['debit'] if row['debit'] != 0 else -row['credit'], axis=1)
         
-        df['id'] = [str(uuid.uuid4()) for _ in range(len(df))]
+        df['id'] = generate_unique_ids(len(df))
         return self._clean_dataframe(df)
     
+    def _read_csv(self, content: bytes) -> pd.DataFrame:
+        """Decode and parse a CSV export, trying the usual encodings and separators"""
+        for encoding in ['utf-8', 'latin-1', 'cp1252']:
+            try:
+                text_content = content.decode(encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            raise ValueError("Could not decode file with any supported encoding")
+        
+        # A separator missing from the header line can only yield one column, so
+        # skip it instead of parsing the whole file with it first
+        header = next((line for line in io.StringIO(text_content) if line.strip()), '')
+        for sep in [',', ';', '\t']:
+            if sep not in header:
+                continue
+            try:
+                df = pd.read_csv(io.StringIO(text_content), sep=sep)
+                if len(df.columns) > 1:
+                    return df
+            except Exception:
+                continue
+        raise ValueError("Could not parse CSV with any supported separator")
+    
     def parse_bank_csv(self, content: bytes) -> pd.DataFrame:
         """Parse bank CSV file with common Tunisian bank formats"""
         try:
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    text_content = content.decode(encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError("Could not decode file with any supported encoding")
-            
-            for sep in [',', ';', '\t']:
-                try:
-                    df = pd.read_csv(io.StringIO(text_content), sep=sep)
-                    if len(df.columns) > 1:
-                        break
-                except:
-                    continue
-            else:
-                raise ValueError("Could not parse CSV with any supported separator")
+            df = self._read_csv(content)
             
             df.columns = df.columns.str.lower().str.strip()
             
@@ -231,7 +231,7 @@ class FileProcessor:
                 df['credit'] = pd.to_numeric(df['credit'], errors='coerce').fillna(0)
                 df['amount'] = df['credit'] - df['debit']
             
-            df['id'] = [str(uuid.uuid4()) for _ in range(len(df))]
+            df['id'] = generate_unique_ids(len(df))
             
             return self._clean_dataframe(df)
             
@@ -241,24 +241,7 @@ class FileProcessor:
     def parse_accounting_csv(self, content: bytes) -> pd.DataFrame:
         """Parse accounting CSV file"""
         try:
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    text_content = content.decode(encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError("Could not decode file with any supported encoding")
-            
-            for sep in [',', ';', '\t']:
-                try:
-                    df = pd.read_csv(io.StringIO(text_content), sep=sep)
-                    if len(df.columns) > 1:
-                        break
-                except:
-                    continue
-            else:
-                raise ValueError("Could not parse CSV with any supported separator")
+            df = self._read_csv(content)
             
             return self._normalize_accounting_data(df)
             
@@ -350,7 +333,7 @@ class FileProcessor:
         for col in required_cols:
             if col not in df.columns:
                 if col == 'id':
-                    df['id'] = [str(uuid.uuid4()) for _ in range(len(df))]
+                    df['id'] = generate_unique_ids(len(df))
                 elif col == 'date':
                     df['date'] = pd.Timestamp.now()
                 elif col == 'description':
@@ -0,0 +1,34 @@
+"""
+LLM response cache
+Raw model responses stored on disk under CACHE_DIR, keyed by a content hash
+"""
+import os
+import time
+from typing import Optional
+from config import CACHE_DIR, AI_CACHE_TTL_SECONDS
+from utils.logger import logger
+
+def _path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"llm_{key}.json")
+
+def get(key: str) -> Optional[str]:
+    """Cached response for key, or None if missing/expired/unreadable"""
+    path = _path(key)
+    try:
+        if time.time() - os.path.getmtime(path) > AI_CACHE_TTL_SECONDS:
+            return None
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def set(key: str, value: str):
+    path = _path(key)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(value)
+        os.replace(tmp_path, path)  # atomic, concurrent readers never see a partial file
+    except OSError as e:
+        logger.warning("Could not write LLM cache: %s", e)
@@ -3,13 +3,15 @@ from rapidfuzz import fuzz
 from typing import List, Dict, Tuple
 import uuid
 import time
+import logging
 from datetime import datetime, timedelta
 from models import *
-from services.ai_assistant import compare_labels, categorize_transaction
+from services.ai_assistant import compare_labels_batch, categorize_transactions_batch
 from services.validation_service import ValidationService
 from services.gap_calculator import GapCalculator
 from services.tunisian_config import TunisianBankConfig
-from utils.logger import log_matching_step
+from utils.logger import log_matching_step, logger
+from utils.helpers import generate_unique_ids
 
 class ReconciliationEngine:
     def __init__(self, rules: ReconciliationRules = None):
@@ -47,17 +49,17 @@ class ReconciliationEngine:
         level1_matches = self._find_level1_matches(bank_df, accounting_df)
         self._update_used_ids(level1_matches, used_bank_ids, used_accounting_ids)
         matches.extend(level1_matches)
-        print(f"DEBUG: Level 1 matched {len(level1_matches)} transactions")
+        logger.debug("Level 1 matched %d transactions", len(level1_matches))
         
         # LEVEL 2: Amount only + date tolerance = 5 days
         remaining_bank = bank_df[~bank_df['id'].isin(used_bank_ids)]
         remaining_accounting = accounting_df[~accounting_df['id'].isin(used_accounting_ids)]
-        print(f"DEBUG: Level 2 - Remaining bank: {len(remaining_bank)}, accounting: {len(remaining_accounting)}")
+        logger.debug("Level 2 - Remaining bank: %d, accounting: %d", len(remaining_bank), len(remaining_accounting))
         
         level2_matches = self._find_level2_matches(remaining_bank, remaining_accounting)
         self._update_used_ids(level2_matches, used_bank_ids, used_accounting_ids)
         matches.extend(level2_matches)
-        print(f"DEBUG: Level 2 matched {len(level2_matches)} transactions")
+        logger.debug("Level 2 matched %d transactions", len(level2_matches))
         
         # LEVEL 3: Group matching (sum = sum)
         remaining_bank = bank_df[~bank_df['id'].isin(used_bank_ids)]
@@ -149,7 +151,12 @@ class ReconciliationEngine:
             "gap_calculations": gap_calculations,
             "gap_coherence": gap_coherence,
             "processing_metrics": self.processing_metrics,
-            "gap_report": self.gap_calculator.generate_gap_report()
+            "gap_report": self.gap_calculator.generate_gap_report(),
+            # Flags read by the route's performance metrics, computed once here
+            "critical_error_count": sum(
+                1 for e in validation_result.get("errors", []) if e.get("severity") == "critical"
+            ),
+            "reconciliation_succeeded": gap_calculations["is_balanced"]
         }
         
         return result
@@ -159,7 +166,7 @@ class ReconciliationEngine:
         df = df.copy()
         
         if 'id' not in df.columns:
-            df['id'] = [str(uuid.uuid4()) for _ in range(len(df))]
+            df['id'] = generate_unique_ids(len(df))
         
         if 'date' in df.columns:
             # Keep as Timestamp for proper date arithmetic
@@ -253,25 +260,29 @@ class ReconciliationEngine:
                 (~accounting_df['id'].isin(used_acc_ids))
             ]
             
+            in_window = []
             for _, acc_row in candidates.iterrows():
                 date_diff = abs((bank_row['date'] - acc_row['date']).days)
                 if date_diff <= self.rules.weak_date_tolerance_days:
-                    # Try AI first, fallback to fuzzy if AI fails
-                    ai_result = compare_labels(bank_row['description'], acc_row['description'])
-                    
-                    if isinstance(ai_result, dict):
-                        ai_similarity = ai_result.get('score', 0.0)
-                        # If AI failed (fallback=True), use fuzzy matching instead
-                        if ai_result.get('fallback', False):
-                            ai_similarity = fuzz.token_sort_ratio(bank_row['description'], acc_row['description']) / 100
-                    else:
-                        ai_similarity = float(ai_result) if ai_result else 0.0
-                    
-                    if ai_similarity >= 0.7:  # AI threshold
-                        score = self._calculate_ai_score(bank_row, acc_row, ai_similarity, date_diff)
-                        if score > best_score:
-                            best_score = score
-                            best_match = acc_row
+                    in_window.append((acc_row, date_diff))
+            if not in_window:
+                continue
+            
+            # Try AI first (one request for all candidates of this bank row), fallback to fuzzy if AI fails
+            ai_results = compare_labels_batch(
+                [(bank_row['description'], acc_row['description']) for acc_row, _ in in_window]
+            )
+            for (acc_row, date_diff), ai_result in zip(in_window, ai_results):
+                ai_similarity = ai_result.get('score', 0.0)
+                # If AI failed (fallback=True), use fuzzy matching instead
+                if ai_result.get('fallback', False):
+                    ai_similarity = fuzz.token_sort_ratio(bank_row['description'], acc_row['description']) / 100
+                
+                if ai_similarity >= 0.7:  # AI threshold
+                    score = self._calculate_ai_score(bank_row, acc_row, ai_similarity, date_diff)
+                    if score > best_score:
+                        best_score = score
+                        best_match = acc_row
             
             if best_match is not None and best_score >= 0.65:
                 match = self._create_match(bank_row, best_match, best_score, MatchRule.AI_ASSISTED)
@@ -326,14 +337,15 @@ class ReconciliationEngine:
         # Limit to first 100 items to avoid quota issues (with rate limiting, this is safe)
         categorize_with_ai = self.rules.enable_ai_assistance and len(unmatched_bank) <= 100
         
-        for _, row in unmatched_bank.iterrows():
-            if categorize_with_ai:
-                category_result = categorize_transaction(row['description'])
-                suggested_category = category_result.get("category")
-                ai_confidence = category_result.get("confidence")
-            else:
-                suggested_category = None
-                ai_confidence = None
+        # One AI request per AI_CONFIG["batch_size"] descriptions instead of one per row
+        category_results = (
+            categorize_transactions_batch(unmatched_bank['description'].tolist())
+            if categorize_with_ai else [{}] * len(unmatched_bank)
+        )
+        
+        for (_, row), category_result in zip(unmatched_bank.iterrows(), category_results):
+            suggested_category = category_result.get("category")
+            ai_confidence = category_result.get("confidence")
             
             suspense.append(SuspenseItem(
                 transaction=self._row_to_transaction(row),
@@ -451,6 +463,8 @@ class ReconciliationEngine:
         """LEVEL 2: Amount only + date tolerance = 5 days"""
         matches = []
         used_acc_ids = set()
+        # Checked once: the per-row debug calls below would otherwise build their args every row
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         
         for _, bank_row in bank_df.iterrows():
             # Skip balance lines
@@ -465,7 +479,8 @@ class ReconciliationEngine:
             ]
             
             if len(candidates) == 0:
-                print(f"DEBUG L2: No candidates for {bank_row['description']} amount={bank_row['amount']}")
+                if debug_enabled:
+                    logger.debug("L2: No candidates for %s amount=%s", bank_row['description'], bank_row['amount'])
                 continue
             
             for _, acc_row in candidates.iterrows():
@@ -473,7 +488,9 @@ class ReconciliationEngine:
                     bank_date = bank_row['date']
                     acc_date = acc_row['date']
                     
-                    print(f"DEBUG L2: bank_date={bank_date} type={type(bank_date)}, acc_date={acc_date} type={type(acc_date)}")
+                    if debug_enabled:
+                        logger.debug("L2: bank_date=%s type=%s, acc_date=%s type=%s",
+                                     bank_date, type(bank_date), acc_date, type(acc_date))
                     
                     # Convert to Timestamp
                     if not isinstance(bank_date, pd.Timestamp):
@@ -482,18 +499,18 @@ class ReconciliationEngine:
                         acc_date = pd.Timestamp(acc_date)
                     
                     date_diff = abs((bank_date - acc_date).days)
-                    print(f"DEBUG L2: {bank_row['description']} date_diff={date_diff}")
+                    if debug_enabled:
+                        logger.debug("L2: %s date_diff=%s", bank_row['description'], date_diff)
                 except Exception as e:
-                    print(f"DEBUG L2: ERROR: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.debug("L2: ERROR: %s", e, exc_info=True)
                     date_diff = 999
                     
                 if date_diff <= 5:  # ±5 days
                     match = self._create_match(bank_row, acc_row, 0.9, MatchRule.FUZZY_STRONG)
                     matches.append(match)
                     used_acc_ids.add(acc_row['id'])
-                    print(f"DEBUG L2: ✅ MATCHED {bank_row['description']}")
+                    if debug_enabled:
+                        logger.debug("L2: MATCHED %s", bank_row['description'])
                     break  # Take first match
         
         return matches
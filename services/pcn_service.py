@@ -2,6 +2,9 @@
 Tunisian PCN (Plan Comptable National) Service
 Complete reference data for Tunisian accounting chart of accounts
 """
+import re
+import numpy as np
+import pandas as pd
 
 class PCNService:
     """Production-ready PCN validation and mapping service"""
@@ -161,6 +164,22 @@ class PCNService:
         "AUTRE": "471000",  # Other (suspense)
     }
     
+    # Description keyword rules in priority order: (keywords, category if amount > 0, category otherwise)
+    DESCRIPTION_RULES = [
+        (["frais", "commission", "agios", "tenue de compte"], "FRAIS_BANCAIRE", "FRAIS_BANCAIRE"),
+        (["interet", "intérêt"], "INTERET_CREDITEUR", "INTERET_DEBITEUR"),
+        (["virement", "vir", "transfer"], "VIREMENT_RECU", "VIREMENT_EMIS"),
+        (["cheque", "chèque", "chq"], "CHEQUE", "CHEQUE"),
+        (["carte", "card", "cb"], "CARTE_BANCAIRE", "CARTE_BANCAIRE"),
+        (["prelevement", "prélèvement", "prlv"], "PRELEVEMENT", "PRELEVEMENT"),
+    ]
+    
+    # One alternation per rule, compiled once for the bulk path
+    _RULE_PATTERNS = [
+        re.compile("|".join(re.escape(word) for word in words))
+        for words, _, _ in DESCRIPTION_RULES
+    ]
+    
     @classmethod
     def validate_account(cls, account_code: str) -> dict:
         """Validate if account code exists in PCN"""
@@ -217,38 +236,50 @@ class PCNService:
         """Suggest PCN account based on transaction description"""
         description_lower = description.lower()
         
-        # Bank fees patterns
-        if any(word in description_lower for word in ["frais", "commission", "agios", "tenue de compte"]):
-            return cls.get_account_for_category("FRAIS_BANCAIRE")
-        
-        # Interest patterns
-        if "interet" in description_lower or "intérêt" in description_lower:
-            if amount > 0:
-                return cls.get_account_for_category("INTERET_CREDITEUR")
-            else:
-                return cls.get_account_for_category("INTERET_DEBITEUR")
+        for words, positive_category, other_category in cls.DESCRIPTION_RULES:
+            if any(word in description_lower for word in words):
+                return cls.get_account_for_category(positive_category if amount > 0 else other_category)
         
-        # Transfer patterns
-        if any(word in description_lower for word in ["virement", "vir", "transfer"]):
-            if amount > 0:
-                return cls.get_account_for_category("VIREMENT_RECU")
-            else:
-                return cls.get_account_for_category("VIREMENT_EMIS")
+        # Default to suspense account
+        return cls.get_account_for_category("AUTRE")
+    
+    @classmethod
+    def suggest_accounts_bulk(cls, descriptions: pd.Series, amounts: pd.Series) -> pd.DataFrame:
+        """Suggest PCN accounts for a whole batch of descriptions at once.
         
-        # Check patterns
-        if any(word in description_lower for word in ["cheque", "chèque", "chq"]):
-            return cls.get_account_for_category("CHEQUE")
+        Same rules as suggest_account_for_description; returns one row per input
+        with account_code, name, type and confidence columns.
+        """
+        # Bank labels repeat a lot (fees, standing orders...): scan each distinct text once
+        codes, uniques = pd.factorize(descriptions.fillna("").astype(str))
         
-        # Card patterns
-        if any(word in description_lower for word in ["carte", "card", "cb"]):
-            return cls.get_account_for_category("CARTE_BANCAIRE")
+        # One lowercased string for the distinct texts, separated by NUL (never in a keyword,
+        # so no match can straddle two texts); each rule is then a single regex scan in C
+        text = "\x00".join(uniques.tolist()).lower()
+        text_ends = np.flatnonzero(np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32) == 0)
+        positive = np.asarray(amounts, dtype=float) > 0
         
-        # Direct debit patterns
-        if any(word in description_lower for word in ["prelevement", "prélèvement", "prlv"]):
-            return cls.get_account_for_category("PRELEVEMENT")
+        conditions = []
+        choices = []
+        for pattern, (_, positive_category, other_category) in zip(cls._RULE_PATTERNS, cls.DESCRIPTION_RULES):
+            unique_hit = np.zeros(len(uniques), dtype=bool)
+            unique_hit[np.searchsorted(text_ends, [m.start() for m in pattern.finditer(text)])] = True
+            hit = unique_hit[codes]
+            conditions += [hit & positive, hit & ~positive]
+            choices += [positive_category, other_category]
+        categories, row_category = np.unique(
+            np.select(conditions, choices, default="AUTRE"), return_inverse=True
+        )
         
-        # Default to suspense account
-        return cls.get_account_for_category("AUTRE")
+        # Few distinct categories: resolve each one once, then broadcast per row
+        resolved = [cls.get_account_for_category(category) for category in categories]
+        return pd.DataFrame(
+            {
+                column: np.array([account[column] for account in resolved], dtype=object)[row_category]
+                for column in ("account_code", "name", "type", "confidence")
+            },
+            index=descriptions.index
+        )
     
     @classmethod
     def get_all_accounts(cls) -> dict:
@@ -33,6 +33,15 @@ class TunisianBankConfig:
         'DEBIT': ['DEBIT', 'RETRAIT']
     }
     
+    # pdfplumber extract_text options for line-oriented statements: no layout
+    # reconstruction. Chars stay sorted by position, generators that draw one
+    # column at a time would otherwise come out one column per line
+    PDF_TEXT_OPTIONS = {
+        'layout': False,
+        'x_tolerance': 3,
+        'y_tolerance': 3,
+    }
+    
     @classmethod
     def normalize_transaction_type(cls, description: str) -> str:
         """Normalize transaction description to standard Tunisian types"""
@@ -51,16 +60,17 @@ class TunisianBankConfig:
         if not isinstance(amount_str, str):
             amount_str = str(amount_str)
         
-        amount_str = amount_str.replace(' ', '').replace('TND', '').replace('DT', '').replace('None', '')
-        
-        if not amount_str or amount_str == '':
-            return 0.0
+        # Hot path (every debit/credit/solde cell): substring checks are cheaper than
+        # replace() calls that find nothing, so most amounts only pay for the last two
+        if ' ' in amount_str:
+            amount_str = amount_str.replace(' ', '')
+        if 'D' in amount_str or 'N' in amount_str:
+            amount_str = amount_str.replace('TND', '').replace('DT', '').replace('None', '')
         
         # Tunisian format: dots are thousands separators, comma is decimal separator
         # Remove all dots (thousands separators), then replace comma with dot
-        amount_str = amount_str.replace('.', '').replace(',', '.')
-        
         try:
-            return float(amount_str)
+            return float(amount_str.replace('.', '').replace(',', '.'))
         except ValueError:
-            return 0.0
+            # Includes the empty string
+            return 0.0
\ No newline at end of file
@@ -17,10 +17,24 @@ if __name__ == "__main__":
     print("📖 API Documentation: http://localhost:8000/docs")
     print("=" * 50)
     
-    uvicorn.run(
-        "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
\ No newline at end of file
+    from config import settings
+    if settings.dev_reload:
+        # DEV=1: auto-reload, single process
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # uvloop + httptools when installed (uvicorn[standard]); WORKERS processes.
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=settings.workers,
+            loop="auto",
+            http="auto",
+            log_level="warning"
+        )
\ No newline at end of file
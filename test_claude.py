@@ -5,16 +5,13 @@ Test Claude API key
 
 import anthropic
 from anthropic import NotFoundError
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
+from config import settings
 
 def test_claude_api():
     """Test if Claude API key is valid by trying all available models"""
     
     # Get API key from environment
-    api_key = os.getenv("CLAUDE_API_KEY")
+    api_key = settings.claude_api_key
     
     if not api_key:
         print("❌ CLAUDE_API_KEY not found in .env file")
@@ -0,0 +1,81 @@
+"""
+Test script for the COPY ingest path of bulk_insert_transactions
+Needs DATABASE_URL pointing to a PostgreSQL database (COPY is Postgres-only)
+"""
+import sys
+import datetime
+sys.path.append('.')
+
+from sqlalchemy import text
+
+from database import Base, get_engine, SessionLocal
+from db_models import all_models
+from db_models.files import UploadedFile
+
+FILE_ID = "test-copy-insert"
+
+
+def test_copy_insert():
+    print("=" * 80)
+    print("COPY INGEST TEST")
+    print("=" * 80)
+
+    engine = get_engine()
+    if engine.dialect.name != "postgresql":
+        print("⚠️ DATABASE_URL is not PostgreSQL, COPY path not testable")
+        return
+
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        db.add(UploadedFile(id=FILE_ID, filename="copy.csv", file_type="accounting", file_path="copy.csv"))
+        db.flush()
+
+        rows = [
+            {"id": f"{FILE_ID}-1", "file_id": FILE_ID, "date": datetime.date(2024, 1, 2), "amount": 1.5,
+             "description": 'VIR, "X"\ttab\nligne \\N', "account_code": ""},
+            {"id": f"{FILE_ID}-2", "file_id": FILE_ID, "date": datetime.date(2024, 1, 3), "amount": -2.0,
+             "description": "", "account_code": None},
+        ]
+        all_models._copy_insert(db, all_models.AccountingTransaction, rows)
+        # A retried upload must skip the rows already stored
+        all_models._copy_insert(db, all_models.AccountingTransaction, rows)
+        db.commit()
+
+        stored = db.execute(text(
+            "SELECT description, account_code, currency, status FROM accounting_transactions "
+            "WHERE file_id = :file_id ORDER BY id"
+        ), {"file_id": FILE_ID}).all()
+        assert len(stored) == 2, stored
+        assert stored[0].description == rows[0]["description"], stored[0]
+        assert stored[0].account_code == "", stored[0]
+        assert stored[1].description == "", stored[1]
+        assert stored[1].account_code is None, stored[1]
+        assert all(r.currency == "TND" and r.status == "unmatched" for r in stored), stored
+        print("✅ NULL / chaîne vide / échappements préservés, doublons ignorés")
+
+        count = all_models.COPY_THRESHOLD_ROWS + 5
+        bank_rows = [
+            {"id": f"{FILE_ID}-b{i}", "file_id": FILE_ID, "date": datetime.date(2024, 1, 1),
+             "amount": float(i), "description": f"OP {i}", "currency": "TND"}
+            for i in range(count)
+        ]
+        all_models.bulk_insert_transactions(db, bank_rows, is_bank=True)
+        db.commit()
+
+        inserted = db.execute(text(
+            "SELECT count(*) FROM bank_transactions WHERE file_id = :file_id"
+        ), {"file_id": FILE_ID}).scalar()
+        assert inserted == count, inserted
+        print(f"✅ Transactions bancaires insérées via COPY: {inserted}")
+    finally:
+        db.rollback()
+        for table in ("bank_transactions", "accounting_transactions", "uploaded_files"):
+            column = "id" if table == "uploaded_files" else "file_id"
+            db.execute(text(f"DELETE FROM {table} WHERE {column} = :file_id"), {"file_id": FILE_ID})
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    test_copy_insert()
@@ -1,12 +1,25 @@
 import uuid
 import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 def generate_unique_id() -> str:
     """Generate unique identifier"""
     return str(uuid.uuid4())
 
+def generate_unique_ids(count: int) -> List[str]:
+    """Generate count random (v4) identifiers from a single os.urandom call"""
+    raw = bytearray(os.urandom(16 * count))
+    # Version 4 and RFC 4122 variant bits, set for every id at once
+    raw[6::16] = bytes(b & 0x0F | 0x40 for b in raw[6::16])
+    raw[8::16] = bytes(b & 0x3F | 0x80 for b in raw[8::16])
+    # One hex conversion for the whole batch instead of a uuid.UUID object per id
+    h = raw.hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, 32 * count, 32)
+    ]
+
 def generate_recon_id(counter: int, prefix: str = "R") -> str:
     """Generate reconciliation ID (N° R)"""
     return f"{prefix}{counter:06d}"
@@ -1,7 +1,9 @@
 import sys
 sys.path.append('.')
 import pandas as pd
+from sqlalchemy import select
 from services.database_service import DatabaseService
+from db_models.transactions import BankTransaction, AccountingTransaction
 from database import SessionLocal
 
 db = SessionLocal()
@@ -22,8 +24,14 @@ bank_file = db_service.get_uploaded_file(str(latest_recon.bank_file_id))
 acc_file = db_service.get_uploaded_file(str(latest_recon.accounting_file_id))
 
 if bank_file and acc_file:
-    bank_df = pd.read_csv(bank_file.file_path)
-    acc_df = pd.read_csv(acc_file.file_path)
+    # Transactions already parsed and typed at upload: read them back instead of re-parsing the raw file
+    # (which may be a PDF/Excel/image), and only the columns printed below
+    def load_transactions(model, file_id):
+        stmt = select(model.date, model.description, model.amount).where(model.file_id == file_id)
+        return pd.read_sql(stmt, db.connection())
+    
+    bank_df = load_transactions(BankTransaction, bank_file.id)
+    acc_df = load_transactions(AccountingTransaction, acc_file.id)
     
     print(f"\nBANQUE: {len(bank_df)} transactions")
     print("10 premières transactions:")